@@ -0,0 +1,150 @@
+import os
+import sys
+import csv
+import time
+import argparse
+import itertools
+import statistics
+import multiprocessing
+
+#workers run headless - the SDL dummy drivers are selected before pygame initializes
+from headless import BOTS, RandomBot, create_headless_game, run_headless
+from earth_defense import TICK_RATE
+
+#the GameHandler attributes a sweep can vary, with their command-line flags and types
+PARAMETERS = (('spawn_interval', '--spawn-interval', int),
+              ('enemy_vel', '--enemy-vel', float),
+              ('max_enemies', '--max-enemies', int),
+              ('powerup_drop_chance', '--drop-chance', float),
+              ('laser_range', '--laser-range', float),
+              ('player_health', '--player-health', int))
+
+#the headless Main of a worker process, created once by init_worker and reused by every game it plays
+worker_main = None
+
+
+#----------BALANCE MODE----------
+class BalanceMode(object):
+    '''
+    CLASS DESCRIPTION:
+        A game mode applying one point of a parameter sweep to every new game, before the player is created.
+
+    ----------
+    ATTRIBUTES:
+        params - mapping of GameHandler attribute names to the values they are set to
+
+    ----------
+    METHODS:
+        __init__(self, params):
+            Creates the mode with the passed parameter values.
+
+        setup(self, main):
+            Applies the parameter values to the new game of the passed Main object.
+    '''
+    def __init__(self, params):
+        self.params = params
+
+    def setup(self, main):
+        for name, value in self.params.items():
+            setattr(main.game, name, value)
+
+
+#----------PROCESS POOL----------
+def init_worker():
+    '''Creates the worker's headless Main, loading the assets once for every game the worker plays.'''
+    global worker_main
+
+    #without SDL's signal handlers the pool can still stop its workers with SIGTERM
+    os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', '1')
+    worker_main = create_headless_game()
+
+
+def play_game(task):
+    '''Plays one headless game for a (config index, params, seed, bot name, max ticks) task. Returns the config index and game stats.'''
+    index, params, seed, bot_name, max_ticks = task
+    bot = RandomBot(seed) if bot_name == 'random' else BOTS[bot_name]()
+
+    worker_main.game_mode = BalanceMode(params)
+    stats = run_headless(worker_main, bot, max_ticks, seed)
+    stats['survived'] = not stats['game_over']
+    return index, stats
+
+
+def run_sweep(configs, games, bot_name='tracking', max_ticks=None, workers=None, seed=0):
+    '''
+    Plays games headless games for every parameter config across a process pool with one worker per core unless
+    workers is passed. Game seeds are seed, seed + 1, ..., so every config is played on the same games.
+    Returns the list of game stats of every config.
+    '''
+    tasks = [(index, params, seed + game, bot_name, max_ticks) for index, params in enumerate(configs) for game in range(games)]
+    results = [[] for params in configs]
+    workers = workers or os.cpu_count()
+
+    #a few chunks per worker keeps the pool balanced without a round trip per game
+    with multiprocessing.Pool(workers, initializer=init_worker) as pool:
+        chunksize = max(1, len(tasks) // (4 * workers))
+        for index, stats in pool.imap_unordered(play_game, tasks, chunksize):
+            results[index].append(stats)
+        pool.close()
+        pool.join()
+
+    return results
+
+
+def summarize(params, results):
+    '''Aggregates the game stats of one config into a row of the results table.'''
+    row = dict(params)
+    row['games'] = len(results)
+    row['survived'] = sum(stats['survived'] for stats in results) / len(results)
+    row['survival_s'] = statistics.fmean(stats['sim_seconds'] for stats in results)
+    for name in ('kills', 'earth_damage', 'player_hits', 'powerups_collected'):
+        row[name] = statistics.fmean(stats[name] for stats in results)
+    return row
+
+
+def print_table(rows):
+    '''Prints the results table, one row per config.'''
+    columns = list(rows[0])
+    widths = [max(len(column), 10) for column in columns]
+    print(' '.join('%*s' % (width, column) for width, column in zip(widths, columns)))
+    for row in rows:
+        print(' '.join('%*s' % (width, ('%.2f' % row[column]) if isinstance(row[column], float) else row[column])
+                       for width, column in zip(widths, columns)))
+
+
+def parse_values(text, value_type):
+    '''Parses a comma-separated list of parameter values.'''
+    return [value_type(value) for value in text.split(',')]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sweep Earth Defense game parameters over many headless games played by a scripted bot.')
+    for name, flag, value_type in PARAMETERS:
+        parser.add_argument(flag, dest=name, help='comma-separated values of GameHandler.%s to sweep' % name)
+    parser.add_argument('--games', type=int, default=100, help='games played per parameter combination')
+    parser.add_argument('--bot', choices=sorted(BOTS), default='tracking', help='scripted player providing the inputs')
+    parser.add_argument('--max-seconds', type=float, default=300, help='simulated seconds after which a game counts as survived')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (defaults to one per core)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game of every combination')
+    parser.add_argument('--output', help='CSV file to save the results table to')
+    args = parser.parse_args()
+
+    #every combination of the swept values, parameters left out keep the game's defaults
+    swept = [(name, parse_values(getattr(args, name), value_type)) for name, flag, value_type in PARAMETERS if getattr(args, name)]
+    configs = [dict(zip([name for name, values in swept], combination)) for combination in itertools.product(*[values for name, values in swept])]
+
+    start = time.perf_counter()
+    results = run_sweep(configs, args.games, args.bot, int(args.max_seconds * TICK_RATE), args.workers, args.seed)
+    wall_seconds = time.perf_counter() - start
+
+    rows = [summarize(params, config_results) for params, config_results in zip(configs, results)]
+    print_table(rows)
+    print('\n%d games in %.1f s on %d workers' % (len(configs) * args.games, wall_seconds, args.workers or os.cpu_count()))
+
+    if args.output:
+        with open(args.output, 'w', newline='') as output_file:
+            writer = csv.DictWriter(output_file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    sys.exit(0)
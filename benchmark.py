@@ -0,0 +1,195 @@
+import os
+import sys
+import json
+import time
+import math
+import random
+import platform
+import argparse
+import statistics
+
+#SDL dummy drivers - no window and no audio device, must be set before pygame initializes
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from pygame.locals import *
+
+from earth_defense import *
+from classes import *
+from headless import create_headless_game
+
+#phases of a tick and a frame, as Main.update_tick and Main.render_frame time them through the frame profiler
+PHASES = ['timers', 'player_input', 'lasers', 'enemies', 'explosions', 'powerups', 'counters', 'redraw', 'display_update']
+
+
+#----------SYNTHETIC WORLDS----------
+class SyntheticWorld(object):
+    '''
+    CLASS DESCRIPTION:
+        Fills a headless game with a fixed number of enemies, lasers, explosions and powerups, and tops the groups
+        back up between ticks so every timed tick sees the same entity counts.
+
+    ----------
+    ATTRIBUTES:
+        main - the headless Main object holding the game
+        size - the number of entities kept in each of the enemy, laser, explosion and powerup groups
+        rng - the random generator placing the entities
+
+    ----------
+    METHODS:
+        __init__(self, main, size, seed):
+            Starts a new game and fills it to the passed size.
+
+        refill(self):
+            Tops every group back up to size and keeps the game from ending.
+    '''
+    def __init__(self, main, size, seed=0):
+        self.main = main
+        self.size = size
+        self.rng = random.Random(seed)
+
+        main.new_game(seed)
+        self.refill()
+
+    def refill(self):
+        main = self.main
+        rng = self.rng
+
+        while len(main.enemy_list) < self.size:
+            enemy = EnemyShip(main.enemy_list, rng.uniform(0, DISPLAY_WIDTH - ENEMY_WIDTH), rng.uniform(-ENEMY_HEIGHT, DISPLAY_HEIGHT / 2),
+                ENEMY_WIDTH, ENEMY_HEIGHT)
+            enemy.set_sprite(enemy_sprites[rng.randint(0, len(enemy_sprites) - 1)])
+
+        while len(main.laser_list) < self.size:
+            Laser(main.laser_list, rng.uniform(0, DISPLAY_WIDTH), rng.uniform(0, DISPLAY_HEIGHT), LASER_WIDTH, LASER_HEIGHT, LASER_VEL, laser_img)
+
+        while len(main.explosion_list) < self.size:
+            Explosion(main.explosion_list, rng.uniform(0, DISPLAY_WIDTH), rng.uniform(0, DISPLAY_HEIGHT), main.explosion_animation,
+                main.game.ticks)
+
+        while len(main.powerup_list) < self.size:
+            modifier = rng.choice(sorted(powerup_imgs))
+            PowerUp(main.powerup_list, rng.uniform(0, DISPLAY_WIDTH), rng.uniform(0, DISPLAY_HEIGHT / 2), POWERUP_WIDTH, POWERUP_HEIGHT,
+                modifier, powerup_imgs[modifier], POWERUP_FRAME_DURATION)
+
+        #keep the game running - Earth damage and collected powerups must not end or change the benchmark
+        main.player_ship.health = main.game.player_health
+        main.player_ship.remove_powerup()
+        main.game.game_over = False
+        main.game.final_explosion = True
+
+
+#----------BENCHMARK----------
+def time_phases(world, iterations, controls=INPUT_FIRE | INPUT_LEFT, collisions=None):
+    '''
+    Runs iterations ticks on the world and gets a dictionary of phase name -> list of timings in milliseconds.
+    The laser broadphase's pair-test counters of every tick are appended to collisions, if a dictionary of lists is passed.
+    '''
+    main = world.main
+    profiler = main.profiler
+    timings = {phase: [] for phase in PHASES}
+
+    #the phases are timed by the game's own tick and frame, so the benchmark follows any change to them
+    if not profiler.enabled:
+        profiler.toggle()
+
+    for i in range(iterations):
+        world.refill()
+        main.update_tick(controls)
+        main.render_frame()
+
+        for phase in PHASES:
+            timings[phase].append(profiler.samples[phase][-1])
+
+        #the enemy grid is rebuilt every tick, so its counters cover this tick's laser tests
+        if collisions is not None:
+            grid_stats = main.enemy_grid.get_stats()
+            collisions['pair_tests'].append(grid_stats['pair_tests'])
+            collisions['brute_force_tests'].append(grid_stats['brute_force_tests'])
+
+    return timings
+
+
+def percentile(samples, fraction):
+    '''Gets the nearest-rank percentile of the samples, with fraction between 0 and 1.'''
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(timings):
+    '''Gets the median, p99 and mean of every phase's timings.'''
+    return {phase: {'median_ms': statistics.median(samples), 'p99_ms': percentile(samples, 0.99), 'mean_ms': statistics.fmean(samples)}
+            for phase, samples in timings.items()}
+
+
+def run_benchmark(sizes, iterations, warmup=10, seed=0, collision_mode=COLLISION_MODE):
+    '''Benchmarks every world size and gets the results, with the run's metadata, as a JSON-serializable dictionary.'''
+    main = create_headless_game()
+    main.collision_mode = collision_mode
+
+    results = {}
+    collision_results = {}
+    for size in sizes:
+        world = SyntheticWorld(main, size, seed)
+        time_phases(world, warmup)
+        collisions = {'pair_tests': [], 'brute_force_tests': []}
+        results[str(size)] = summarize(time_phases(world, iterations, collisions=collisions))
+        collision_results[str(size)] = {name: statistics.fmean(counts) for name, counts in collisions.items()}
+
+    metadata = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+                'pygame': pygame.version.ver, 'platform': platform.platform(), 'iterations': iterations,
+                'warmup': warmup, 'seed': seed, 'collision_mode': collision_mode}
+    return {'metadata': metadata, 'results': results, 'collisions': collision_results}
+
+
+def print_report(report, baseline=None):
+    '''Prints the median and p99 of every phase, with the change against a baseline report if one is passed.'''
+    header = '%8s %-14s %12s %12s' % ('size', 'phase', 'median ms', 'p99 ms')
+    if baseline is not None:
+        header += ' %16s' % 'median vs base'
+    print(header)
+
+    for size, phases in report['results'].items():
+        for phase, summary in phases.items():
+            line = '%8s %-14s %12.4f %12.4f' % (size, phase, summary['median_ms'], summary['p99_ms'])
+
+            if baseline is not None and phase in baseline['results'].get(size, {}):
+                base_median = baseline['results'][size][phase]['median_ms']
+                if base_median:
+                    line += ' %+15.1f%%' % ((summary['median_ms'] / base_median - 1) * 100)
+            print(line)
+
+    #narrow-phase tests per tick of the grid broadphase, against testing every laser against every enemy
+    if report['metadata']['collision_mode'] == 'grid':
+        print('\n%8s %14s %18s %10s' % ('size', 'pair tests', 'brute-force tests', 'ratio'))
+        for size, counts in report.get('collisions', {}).items():
+            ratio = counts['pair_tests'] / counts['brute_force_tests'] if counts['brute_force_tests'] else 0.0
+            print('%8s %14.1f %18.1f %9.1f%%' % (size, counts['pair_tests'], counts['brute_force_tests'], ratio * 100))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the per-tick maintenance phases of Earth Defense on synthetic worlds.')
+    parser.add_argument('--sizes', default='10,100,1000', help='comma-separated entity counts per group')
+    parser.add_argument('--iterations', type=int, default=200, help='timed ticks per world size')
+    parser.add_argument('--warmup', type=int, default=10, help='untimed ticks per world size')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the world layout and the game')
+    parser.add_argument('--collision-mode', choices=['grid', 'batch'], default=COLLISION_MODE, help='laser collision engine')
+    parser.add_argument('--output', help='JSON file to save the results to')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    args = parser.parse_args()
+
+    report = run_benchmark([int(size) for size in args.sizes.split(',')], args.iterations, args.warmup, args.seed, args.collision_mode)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+
+    pygame.quit()
+    sys.exit(0)
@@ -0,0 +1,147 @@
+import os
+import sys
+import mmap
+import struct
+import argparse
+
+import pygame
+
+'''
+ASSET BUNDLE FORMAT (little-endian):
+    header - magic b'EDAB', format version (uint8), number of entries (uint32)
+    index - one record per image: path length (uint16), width (uint16), height (uint16), flags (uint8),
+        pixel data offset from the start of the file (uint64), followed by the UTF-8 path
+    pixel data - the raw pre-scaled pixels of every image, RGBA for alpha images and RGB otherwise,
+        each buffer starting on a BUNDLE_ALIGN byte boundary
+
+    flags - bit 0 is set for images with per-pixel alpha, bit 1 for images kept at their native size (no size in the manifest)
+'''
+BUNDLE_MAGIC = b'EDAB'
+BUNDLE_VERSION = 1
+HEADER = struct.Struct('<4sBI')
+ENTRY = struct.Struct('<HHHBQ')
+FLAG_ALPHA = 0x01
+FLAG_NATIVE_SIZE = 0x02
+BUNDLE_ALIGN = 16
+
+
+def align(offset):
+    '''Rounds offset up to the next BUNDLE_ALIGN boundary.'''
+    return (offset + BUNDLE_ALIGN - 1) // BUNDLE_ALIGN * BUNDLE_ALIGN
+
+
+def build_bundle(manifest, path):
+    '''
+    Decodes and scales every (path, size, alpha) entry of the manifest and writes their raw pixels, with the index,
+    to a bundle file at path. Returns the number of images packed.
+    '''
+    entries = []
+    seen = set()
+    for image_path, size, alpha in manifest:
+        size = None if size is None else (int(size[0]), int(size[1]))
+        if (image_path, size, alpha) in seen:
+            continue
+        seen.add((image_path, size, alpha))
+
+        surface = pygame.image.load(image_path)
+        if size is not None and surface.get_size() != size:
+            surface = pygame.transform.scale(surface, size)
+
+        flags = (FLAG_ALPHA if alpha else 0) | (FLAG_NATIVE_SIZE if size is None else 0)
+        entries.append((image_path.encode('utf-8'), surface.get_size(), flags, pygame.image.tobytes(surface, 'RGBA' if alpha else 'RGB')))
+
+    #lay out the pixel data after the index
+    offset = HEADER.size + sum(ENTRY.size + len(name) for name, size, flags, pixels in entries)
+    offsets = []
+    for name, size, flags, pixels in entries:
+        offset = align(offset)
+        offsets.append(offset)
+        offset += len(pixels)
+
+    with open(path, 'wb') as bundle_file:
+        bundle_file.write(HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(entries)))
+        for (name, size, flags, pixels), offset in zip(entries, offsets):
+            bundle_file.write(ENTRY.pack(len(name), size[0], size[1], flags, offset))
+            bundle_file.write(name)
+
+        for (name, size, flags, pixels), offset in zip(entries, offsets):
+            bundle_file.write(bytes(offset - bundle_file.tell()))
+            bundle_file.write(pixels)
+
+    return len(entries)
+
+
+class AssetBundle(object):
+    '''
+    CLASS DESCRIPTION:
+        A read-only view of an asset bundle file. The file is memory-mapped and surfaces are built straight from the
+        mapped pixel buffers, with no image decoding and no per-image file opens.
+
+    ----------
+    ATTRIBUTES:
+        path - the bundle file
+        data - the memory map of the bundle file
+        index - mapping of (path, size, alpha) asset keys to the (offset, size, pixel format) of their pixel data
+
+    ----------
+    METHODS:
+        __init__(self, path):
+            Maps the bundle file at path and reads its index.
+
+        __contains__(self, key):
+            Returns True if the bundle holds the image for the (path, size, alpha) asset key.
+
+        get_surface(self, key):
+            Gets an unconverted surface over the mapped pixels of the asset key. It shares memory with the bundle,
+            so it must be converted (or copied) before the bundle is closed.
+
+        close(self):
+            Unmaps the bundle file.
+    '''
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as bundle_file:
+            self.data = mmap.mmap(bundle_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count = HEADER.unpack_from(self.data, 0)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            self.data.close()
+            raise ValueError('%s is not a version %d Earth Defense asset bundle' % (path, BUNDLE_VERSION))
+
+        self.index = {}
+        offset = HEADER.size
+        for i in range(count):
+            name_length, width, height, flags, data_offset = ENTRY.unpack_from(self.data, offset)
+            offset += ENTRY.size
+            name = self.data[offset:offset + name_length].decode('utf-8')
+            offset += name_length
+
+            alpha = bool(flags & FLAG_ALPHA)
+            size = None if flags & FLAG_NATIVE_SIZE else (width, height)
+            self.index[(name, size, alpha)] = (data_offset, (width, height), 'RGBA' if alpha else 'RGB')
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def get_surface(self, key):
+        offset, size, pixel_format = self.index[key]
+        length = size[0] * size[1] * len(pixel_format)
+        return pygame.image.frombuffer(memoryview(self.data)[offset:offset + length], size, pixel_format)
+
+    def close(self):
+        self.data.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pack every image of the Earth Defense asset manifest into one bundle file.')
+    parser.add_argument('--output', help='bundle file to write (defaults to ASSET_BUNDLE_PATH)')
+    args = parser.parse_args()
+
+    #decoding and scaling need no window
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from earth_defense import ASSET_MANIFEST, ASSET_BUNDLE_PATH
+
+    output = args.output or ASSET_BUNDLE_PATH
+    count = build_bundle(ASSET_MANIFEST, output)
+    print('packed %d images into %s (%d bytes)' % (count, output, os.path.getsize(output)))
+    sys.exit(0)
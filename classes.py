@@ -1,29 +1,485 @@
+import os
+import math
 import pygame
 from pygame.locals import *
 import random
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from entities import *
+from bundle import AssetBundle
+from scheduler import Scheduler
+
+#NumPy is optional - only frame captures need it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#luma weights for grayscale frame captures, applied as 8-bit fixed point so the sum stays in uint16
+GRAYSCALE_WEIGHTS = (0.299, 0.587, 0.114)
+GRAYSCALE_SHIFT = 8
+GRAYSCALE_FIXED_WEIGHTS = tuple(int(round(weight * (1 << GRAYSCALE_SHIFT))) for weight in GRAYSCALE_WEIGHTS)
+
+class AssetManager(object):
+    '''
+    CLASS DESCRIPTION:
+        A class to decode, convert and scale game images once and share the resulting surfaces between all objects.
+
+    ----------
+    ATTRIBUTES:
+        max_entries - the maximum number of surfaces held in the cache before the least recently used one is evicted
+        scale - the factor every image size is multiplied by, so images match the display's internal resolution
+
+        cache - ordered mapping of (path, output size, alpha) keys to their converted and scaled pygame.Surface
+        bundle - the memory-mapped AssetBundle that cache misses are served from before decoding, None if no bundle is open.
+            Bundles hold images at their unscaled sizes, so they are only used while scale is 1
+
+        hits - the number of requests served from the cache
+        misses - the number of requests that had to decode the image from disk
+        bundled - the number of surfaces built from the asset bundle instead of decoding
+        evictions - the number of surfaces dropped from the cache to respect max_entries
+
+    ----------
+    METHODS:
+        __init__(self, max_entries):
+            Creates an empty asset cache holding at most max_entries surfaces.
+
+        set_scale(self, scale):
+            Sets the scale factor, dropping every surface cached at the previous one.
+
+        scale_size(self, size):
+            Gets the output size of an image requested at size, None for images kept at their native size.
+
+        load(self, path, size, alpha):
+            Returns the shared surface for the image at path, scaled to size times the scale factor (its native size
+            times the scale factor if no size is passed). The image is only decoded on a cache miss.
+
+        preload(self, manifest, workers, progress):
+            Decodes and scales every (path, size, alpha) entry of the manifest on a thread pool, then converts them
+            on the calling thread. progress(done, total) is called after each conversion.
+
+        open_bundle(self, path):
+            Serves cache misses from the asset bundle at path, if the file exists. Returns True if the bundle was opened.
+
+        evict(self, path):
+            Drops every cached surface created from the image at path.
+
+        clear(self):
+            Drops every cached surface and resets the hit/miss counters.
+
+        get_stats(self):
+            Gets a dictionary of the cache counters and current size.
+    '''
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.scale = 1
+        self.cache = OrderedDict()
+
+        self.bundle = None
+
+        self.hits = 0
+        self.misses = 0
+        self.bundled = 0
+        self.evictions = 0
+
+    def set_scale(self, scale):
+        if scale != self.scale:
+            self.scale = scale
+            self.cache.clear()
+
+    def scale_size(self, size):
+        if size is None:
+            return None
+        return (max(1, int(size[0] * self.scale)), max(1, int(size[1] * self.scale)))
+
+    def load(self, path, size=None, alpha=True):
+        size = self.scale_size(size)
+        key = (path, size, alpha)
+
+        #cache hit - mark as most recently used
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        #cache miss - build from the bundle's pre-scaled pixels when possible
+        if self.in_bundle(key):
+            return self.load_bundled(key)
+
+        #otherwise decode and scale once, then convert to the display format
+        self.misses += 1
+        surface = self.decode(path, size)
+        surface = surface.convert_alpha() if alpha else surface.convert()
+
+        self.store(key, surface)
+        return surface
+
+    def preload(self, manifest, workers=None, progress=None):
+        keys = []
+        for path, size, alpha in manifest:
+            key = (path, self.scale_size(size), alpha)
+            if key not in self.cache and key not in keys:
+                keys.append(key)
+
+        #bundled images need no decoding, only the remaining ones go to the thread pool
+        bundled = [key for key in keys if self.in_bundle(key)]
+        for done, key in enumerate(bundled, 1):
+            self.load_bundled(key)
+            if progress is not None:
+                progress(done, len(keys))
+
+        #decoding and scaling release the GIL, but converting needs the display so it stays on this thread
+        with ThreadPoolExecutor(workers) as executor:
+            futures = {executor.submit(self.decode, path, size): (path, size, alpha) for path, size, alpha in keys if (path, size, alpha) not in bundled}
+            for done, future in enumerate(as_completed(futures), len(bundled) + 1):
+                path, size, alpha = key = futures[future]
+                surface = future.result()
+                self.misses += 1
+                self.store(key, surface.convert_alpha() if alpha else surface.convert())
+
+                if progress is not None:
+                    progress(done, len(keys))
+
+        return len(keys)
+
+    def open_bundle(self, path):
+        if not os.path.exists(path):
+            return False
+
+        if self.bundle is not None:
+            self.bundle.close()
+        self.bundle = AssetBundle(path)
+        return True
+
+    def in_bundle(self, key):
+        return self.bundle is not None and self.scale == 1 and key in self.bundle
+
+    def load_bundled(self, key):
+        #the bundle surface shares memory with the mapped file - converting copies it into the display format
+        surface = self.bundle.get_surface(key)
+        surface = surface.convert_alpha() if key[2] else surface.convert()
+        self.bundled += 1
+        self.store(key, surface)
+        return surface
+
+    def decode(self, path, size):
+        surface = pygame.image.load(path)
+        if size is None:
+            size = self.scale_size(surface.get_size())
+        if surface.get_size() != size:
+            surface = pygame.transform.scale(surface, size)
+        return surface
+
+    def store(self, key, surface):
+        self.cache[key] = surface
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+
+    def evict(self, path):
+        for key in [key for key in self.cache if key[0] == path]:
+            del self.cache[key]
+            self.evictions += 1
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+        self.bundled = 0
+        self.evictions = 0
+
+    def get_stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'bundled': self.bundled, 'evictions': self.evictions,
+                'entries': len(self.cache)}
+
+
+#shared asset cache used by every game object
+asset_manager = AssetManager()
+
+
+class HUD(object):
+    '''
+    CLASS DESCRIPTION:
+        A class to hold the on-screen HUD widgets and composite them into a single cached layer.
+
+    ----------
+    ATTRIBUTES:
+        widgets - ordered mapping of widget names to widget objects, later widgets are drawn on top
+
+        layer - the composited surface holding every widget at the display's internal resolution, only rebuilt when a widget changes
+        layer_rect - the rectangle covered by the layer, in game coordinates
+
+        dirty - becomes True when a widget value changes and the layer must be re-composited
+
+    ----------
+    METHODS:
+        __init__(self):
+            Creates an empty HUD.
+
+        add_widget(self, name, widget):
+            Adds (or replaces) a widget and resizes the layer to cover every widget.
+
+        set_value(self, name, *values):
+            Passes new values to the named widget, marking the layer dirty only if the widget changed.
+
+        composite(self):
+            Re-renders every widget into the cached layer.
+
+        draw(self, interface):
+            Blits the cached layer onto the display, re-compositing it first if needed.
+    '''
+    def __init__(self):
+        self.widgets = OrderedDict()
+        self.layer = None
+        self.layer_rect = None
+        self.dirty = True
+
+    def add_widget(self, name, widget):
+        self.widgets[name] = widget
+        self.layer_rect = pygame.Rect(widget.rect)
+        for other in self.widgets.values():
+            self.layer_rect.union_ip(other.rect)
+
+        self.layer = pygame.Surface(asset_manager.scale_size(self.layer_rect.size), SRCALPHA)
+        self.dirty = True
+
+    def set_value(self, name, *values):
+        if self.widgets[name].set_value(*values):
+            self.dirty = True
+
+    def composite(self):
+        self.layer.fill((0, 0, 0, 0))
+        for widget in self.widgets.values():
+            widget.render(self.layer, self.layer_rect.x, self.layer_rect.y, asset_manager.scale)
+        self.dirty = False
+
+    def draw(self, interface):
+        if self.layer is None:
+            return
+
+        if self.dirty:
+            self.composite()
+        interface.redraw(self.layer, self.layer_rect.x, self.layer_rect.y)
+
+
+class HealthbarWidget(object):
+    '''
+    CLASS DESCRIPTION:
+        A HUD widget displaying Earth's healthbar, with every health state pre-rendered once.
+
+    ----------
+    ATTRIBUTES:
+        rect - the position and size of the healthbar, in game coordinates
+
+        states - the pre-scaled healthbar surfaces, from empty to full
+        state - the index of the healthbar surface currently displayed
+        max_value - the health value shown as a full healthbar
+
+    ----------
+    METHODS:
+        __init__(self, images, x, y, width, height):
+            Pre-renders one healthbar surface per image, where images are ordered from empty to full health.
+
+        set_value(self, value, max_value):
+            Sets the displayed health value out of max_value (by default the last one set), scaled onto the healthbar
+            states. Returns True if the displayed state changed.
+
+        render(self, surface, offset_x, offset_y, scale):
+            Draws the current healthbar state onto the passed surface, whose origin is at the game coordinates
+            (offset_x, offset_y) and which is drawn at scale times the game coordinates.
+    '''
+    def __init__(self, images, x, y, width, height):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.states = [asset_manager.load(image, (width, height)) for image in images]
+        self.state = len(self.states) - 1
+        self.max_value = len(self.states) - 1
+
+    def set_value(self, value, max_value=None):
+        if max_value is not None:
+            self.max_value = max_value
+
+        #any health left shows at least the first state, and healths above the last state are clamped
+        state = math.ceil(value * (len(self.states) - 1) / self.max_value) if self.max_value > 0 else 0
+        state = min(max(state, 0), len(self.states) - 1)
+        if state == self.state:
+            return False
+        self.state = state
+        return True
+
+    def render(self, surface, offset_x, offset_y, scale=1):
+        surface.blit(self.states[self.state], ((self.rect.x - offset_x) * scale, (self.rect.y - offset_y) * scale))
+
+
+class Button(object):
+    '''
+    CLASS DESCRIPTION:
+        A clickable menu button with its normal and hovered surfaces scaled once, and a precomputed rectangle for hit-testing.
+
+    ----------
+    ATTRIBUTES:
+        action - the value returned by a Menu when the button is clicked
+
+        rect - the position and size of the button in game coordinates, for hit-testing
+        surface - the button image drawn while the cursor is off the button
+        hovered_surface - the button image drawn while the cursor is over the button
+        hovered - becomes True while the cursor is over the button
+
+    ----------
+    METHODS:
+        __init__(self, action, image, hovered_image, x, y, width, height):
+            Creates a button, loading and scaling both images once.
+
+        set_hover(self, pos):
+            Updates the hover state from the cursor position (in game coordinates) and returns True if it changed.
+
+        draw(self, interface):
+            Redraws the button over the background in its current state and returns the display rectangle it covers.
+    '''
+    def __init__(self, action, image, hovered_image, x, y, width, height):
+        self.action = action
+        self.rect = pygame.Rect(x, y, width, height)
+        self.surface = asset_manager.load(image, (width, height))
+        self.hovered_surface = asset_manager.load(hovered_image, (width, height))
+        self.hovered = False
+
+    def set_hover(self, pos):
+        hovered = self.rect.collidepoint(pos)
+        if hovered == self.hovered:
+            return False
+        self.hovered = hovered
+        return True
+
+    def draw(self, interface):
+        #the button images are transparent, so the background underneath is restored first
+        rect = interface.scale_rect(self.rect)
+        interface.display.blit(interface.background, rect, rect)
+        interface.display.blit(self.hovered_surface if self.hovered else self.surface, rect)
+        return rect
+
+
+class Menu(object):
+    '''
+    CLASS DESCRIPTION:
+        An event-driven menu screen. Sleeps until the next input event instead of polling, and only redraws and
+        refreshes the buttons whose hover state changed.
+
+    ----------
+    ATTRIBUTES:
+        interface - the Interface object the menu is drawn onto
+        images - list of (surface, x, y) static images drawn with the menu
+        buttons - list of Button objects of the menu
+
+    ----------
+    METHODS:
+        __init__(self, interface, images, buttons):
+            Creates a menu from pre-loaded images and buttons.
+
+        draw(self):
+            Draws the whole menu over the current background and refreshes the screen.
+
+        run(self, redraw):
+            Shows the menu until a button is clicked and returns its action, or None if the window is closed.
+            Pass redraw=False if the menu was just drawn.
+    '''
+    def __init__(self, interface, images, buttons):
+        self.interface = interface
+        self.images = images
+        self.buttons = buttons
+
+    def draw(self):
+        self.interface.redraw(self.interface.background, 0, 0)
+        for image, x, y in self.images:
+            self.interface.redraw(image, x, y)
+
+        cursor = self.interface.to_game_coords(pygame.mouse.get_pos())
+        for button in self.buttons:
+            button.set_hover(cursor)
+            button.draw(self.interface)
+
+        self.interface.update()
+
+    def run(self, redraw=True):
+        if redraw:
+            self.draw()
+
+        #a click counts once a button was pressed anywhere, then released over a button
+        mouse_click = False
+        while True:
+            event = pygame.event.wait()
+
+            if event.type == QUIT:
+                return None
+
+            if event.type == MOUSEMOTION:
+                pos = self.interface.to_game_coords(event.pos)
+                for button in self.buttons:
+                    if button.set_hover(pos):
+                        pygame.display.update(button.draw(self.interface))
+
+            elif event.type == MOUSEBUTTONDOWN:
+                mouse_click = True
+
+            elif event.type == MOUSEBUTTONUP and mouse_click:
+                pos = self.interface.to_game_coords(event.pos)
+                for button in self.buttons:
+                    if button.rect.collidepoint(pos):
+                        return button.action
+
 
 class Interface:
     '''
     CLASS DESCRIPTION:
-        A class to maintain and update the main game interface and pygame display attributes.
+        A class to maintain and update the main game interface and pygame display attributes. The game is laid out
+        in game coordinates of a fixed size, drawn at an internal resolution of scale times that size, and the
+        internal resolution is presented through a pygame.SCALED display mode stretched to the window or screen.
 
     ----------
     ATTRIBUTES:
-        display - the main pygame display variable (pygame.Surface type)
+        display - the main pygame display variable (pygame.Surface type), at the internal resolution
 
-        display_width - the pygame surface width
-        display_height - the pygame surface height
+        display_width - the width of the game coordinates
+        display_height - the height of the game coordinates
+
+        scale - the internal resolution as a fraction of the game coordinates (1 draws 1 pixel per game unit)
+        render_width - the width of the display surface, in pixels
+        render_height - the height of the display surface, in pixels
+        fullscreen - becomes True when the display fills the screen instead of a window
 
         background - holds the game's background image
 
         caption - holds the game's caption displayed in the window
 
-        healthbar - the displayed image representing Earth's current healthbar
+        hud - the HUD layer holding Earth's healthbar and any other on-screen widgets
+
+        dirty_rendering - becomes True when only the changed regions of the screen are redrawn and refreshed
+        dirty_rects - the rectangles drawn onto the display during the current frame
+        prev_rects - the rectangles drawn during the previous frame, restored from the background on the next frame
+        restored_rects - the rectangles restored from the background during the current frame
+        full_refresh - becomes True when the next update must refresh the whole screen
+
+        render_queue - mapping of layer numbers to the (image, (x, y)) pairs queued for the current frame,
+            lower layers are drawn first and the lists are reused between frames
+
+        frame_surfaces - mapping of sizes to the preallocated surfaces scaled frame captures are drawn into
+        frame_buffers - mapping of (size, grayscale) to the preallocated arrays scaled frame captures are written to
+        gray_buffers - mapping of sizes to the preallocated (sum, term) uint16 arrays grayscale captures are reduced in
 
     ----------
     METHODS:
-        __init__(self, width, height):
-            Creates a new screen display for the game with the passed dimensions.
+        __init__(self, width, height, dirty_rendering, scale, fullscreen):
+            Creates a new screen display for the game with the passed dimensions in game coordinates, rendered at
+            scale times that size.
+
+        to_game_coords(self, pos):
+            Converts a display position (e.g. a mouse position) to game coordinates.
+
+        scale_rect(self, rect):
+            Converts a rectangle in game coordinates to the display rectangle it covers.
+
+        set_dirty_rendering(self, enabled):
+            Switches between dirty-rectangle rendering and full-screen redraws.
 
         set_background(self, image):
             Sets the background class attribute and blits the background image to the display.
@@ -31,43 +487,195 @@ class Interface:
         set_caption(self, caption):
             Sets the game caption that appears in the overhead.
 
-        update_healthbar(self, healthbar):
-            Updates the Earth healthbar frame that appears on screen.
+        set_healthbar(self, images, width, height):
+            Adds the Earth healthbar widget to the HUD, pre-rendering one frame per health state.
+
+        update_healthbar(self, health, max_health):
+            Updates the Earth healthbar value out of max_health and draws the HUD onto the screen.
+
+        clear_frame(self):
+            Erases the previous frame, either by restoring the previously drawn regions or by redrawing the whole background.
 
         redraw(self, image, x, y):
-            Redraws the passed image onto the screen using pygame's Surface.blit method.
+            Redraws the passed image onto the screen at the game coordinates (x, y) using pygame's Surface.blit method.
+
+        redraw_many(self, blit_sequence):
+            Redraws a sequence of (image, (x, y)) pairs, in game coordinates, in a single Surface.blits call.
+
+        queue(self, layer, image, x, y):
+            Adds an image to the render queue of the passed layer.
+
+        queue_many(self, layer, blit_sequence):
+            Adds a sequence of (image, (x, y)) pairs to the render queue of the passed layer.
+
+        flush(self):
+            Draws the render queue with one Surface.blits call per layer, in layer order, and empties it.
 
         update(self):
-            Refreshes the screen to display newly drawn frame.
+            Refreshes the screen to display newly drawn frame, limited to the changed regions in dirty-rectangle mode.
+
+        get_frame_view(self):
+            Gets a zero-copy (width, height, 3) NumPy view of the display pixels. The display stays locked while the
+            view exists, so it must be deleted before the next frame is drawn.
+
+        get_scaled_frame(self, size, grayscale, out):
+            Gets the display downscaled to size as a (width, height, 3) array, or (width, height) if grayscale,
+            written into out or into a buffer reused by every call with the same size.
     '''
-    def __init__(self, width, height):
+    def __init__(self, width, height, dirty_rendering=False, scale=1, fullscreen=False):
         self.display_width = width
         self.display_height = height
-        self.display = pygame.display.set_mode([self.display_width, self.display_height])
+
+        #SDL stretches the internal resolution to the window or screen, so fill cost follows the internal resolution
+        self.scale = scale
+        self.render_width = max(1, int(width * scale))
+        self.render_height = max(1, int(height * scale))
+        self.fullscreen = fullscreen
+        #a full-size window needs no scaled mode, which keeps the plain window (and headless runs) as before
+        flags = SCALED if scale != 1 or fullscreen else 0
+        self.display = pygame.display.set_mode([self.render_width, self.render_height], flags | (FULLSCREEN if fullscreen else 0))
+
+        #every image is loaded pre-scaled to the internal resolution
+        asset_manager.set_scale(scale)
         self.background = None
         self.caption = None
-        self.healthbar = None
+        self.hud = HUD()
+
+        self.dirty_rendering = dirty_rendering
+        self.dirty_rects = []
+        self.prev_rects = []
+        self.restored_rects = []
+        self.full_refresh = True
+
+        self.render_queue = {}
+
+        self.frame_surfaces = {}
+        self.frame_buffers = {}
+        self.gray_buffers = {}
 
+    def to_game_coords(self, pos):
+        return (pos[0] / self.scale, pos[1] / self.scale)
+
+    def scale_rect(self, rect):
+        scale = self.scale
+        return pygame.Rect(rect[0] * scale, rect[1] * scale, rect[2] * scale, rect[3] * scale)
+
+    def set_dirty_rendering(self, enabled):
+        self.dirty_rendering = enabled
+        self.dirty_rects = []
+        self.prev_rects = []
+        self.restored_rects = []
+        self.full_refresh = True
 
     def set_background(self, image):
-        self.background = pygame.image.load(image).convert()
-        self.background = pygame.transform.scale(self.background, (self.display_width, self.display_height))
+        self.background = asset_manager.load(image, (self.display_width, self.display_height), alpha=False)
         self.display.blit(self.background, (0,0))
+        self.full_refresh = True
 
     def set_caption(self, caption):
         self.caption = caption
         pygame.display.set_caption(caption)
 
-    def update_healthbar(self, healthbar):
-        self.healthbar = pygame.image.load(healthbar).convert_alpha()
-        self.healthbar = pygame.transform.scale(self.healthbar, (175, 75))
-        self.display.blit(self.healthbar, ((self.display_width - 175) / 2, self.display_height - 60))
-        
+    def set_healthbar(self, images, width, height):
+        self.hud.add_widget('healthbar', HealthbarWidget(images, (self.display_width - width) / 2, self.display_height - 60, width, height))
+
+    def update_healthbar(self, health, max_health=None):
+        self.hud.set_value('healthbar', health, max_health)
+        self.hud.draw(self)
+
+    def clear_frame(self):
+        #after a full refresh (e.g. switching to dirty rendering) the previous frame's rectangles are unknown
+        if not self.dirty_rendering or self.full_refresh:
+            self.display.blit(self.background, (0, 0))
+            return
+
+        #only restore the background under what was drawn last frame
+        for rect in self.prev_rects:
+            self.display.blit(self.background, rect, rect)
+        self.restored_rects = self.prev_rects
+
     def redraw(self, image, x, y):
-        self.display.blit(image, (x, y))
+        rect = self.display.blit(image, (x * self.scale, y * self.scale))
+        if self.dirty_rendering:
+            self.dirty_rects.append(rect)
+
+    def redraw_many(self, blit_sequence):
+        #positions are scaled to the internal resolution here, so the game never deals in display pixels
+        if self.scale != 1:
+            scale = self.scale
+            blit_sequence = [(image, (x * scale, y * scale)) for image, (x, y) in blit_sequence]
+
+        #the drawn rectangles are only needed to track dirty regions
+        if self.dirty_rendering:
+            self.dirty_rects.extend(self.display.blits(blit_sequence))
+        else:
+            self.display.blits(blit_sequence, doreturn=False)
+
+    def queue(self, layer, image, x, y):
+        self.render_queue.setdefault(layer, []).append((image, (x, y)))
+
+    def queue_many(self, layer, blit_sequence):
+        self.render_queue.setdefault(layer, []).extend(blit_sequence)
+
+    def flush(self):
+        for layer in sorted(self.render_queue):
+            blit_sequence = self.render_queue[layer]
+            if blit_sequence:
+                self.redraw_many(blit_sequence)
+                blit_sequence.clear()
 
     def update(self):
-        pygame.display.update()
+        if not self.dirty_rendering or self.full_refresh:
+            pygame.display.update()
+            self.full_refresh = False
+
+        else:
+            pygame.display.update(self.restored_rects + self.dirty_rects)
+
+        self.prev_rects = self.dirty_rects
+        self.dirty_rects = []
+        self.restored_rects = []
+
+    def get_frame_view(self):
+        if numpy is None:
+            raise ImportError('Interface.get_frame_view needs NumPy')
+
+        #pixels3d locks the display until the view is garbage collected - blitting onto a locked surface fails
+        return pygame.surfarray.pixels3d(self.display)
+
+    def get_scaled_frame(self, size, grayscale=False, out=None):
+        if numpy is None:
+            raise ImportError('Interface.get_scaled_frame needs NumPy')
+
+        size = (int(size[0]), int(size[1]))
+        surface = self.frame_surfaces.get(size)
+        if surface is None:
+            surface = self.frame_surfaces[size] = pygame.Surface(size, 0, self.display)
+        pygame.transform.smoothscale(self.display, size, surface)
+
+        if out is None:
+            out = self.frame_buffers.get((size, grayscale))
+            if out is None:
+                out = self.frame_buffers[(size, grayscale)] = numpy.empty(size if grayscale else size + (3,), dtype=numpy.uint8)
+
+        #the view of the small surface is released as soon as it has been copied out
+        pixels = pygame.surfarray.pixels3d(surface)
+        if grayscale:
+            #per-channel integer multiply-adds into reused buffers - no temporary arrays per capture
+            buffers = self.gray_buffers.get(size)
+            if buffers is None:
+                buffers = self.gray_buffers[size] = (numpy.empty(size, dtype=numpy.uint16), numpy.empty(size, dtype=numpy.uint16))
+            total, term = buffers
+            numpy.multiply(pixels[..., 0], GRAYSCALE_FIXED_WEIGHTS[0], out=total, dtype=numpy.uint16)
+            for channel in (1, 2):
+                numpy.multiply(pixels[..., channel], GRAYSCALE_FIXED_WEIGHTS[channel], out=term, dtype=numpy.uint16)
+                total += term
+            total >>= GRAYSCALE_SHIFT
+            numpy.copyto(out, total, casting='unsafe')
+        else:
+            numpy.copyto(out, pixels)
+        del pixels
+        return out
 
 
 class GameHandler(object):
@@ -77,13 +685,39 @@ class GameHandler(object):
 
     ----------
     ATTRIBUTES:
-        clock - pygame attribute to keep track of game time
+        clock - pygame attribute to keep track of real time between rendered frames
+
+        seed - the seed of the game's random generator, enough to reproduce a game together with its inputs
+        rng - the game's own random generator, used for every spawn and powerup drop
+
+        ticks - the number of fixed simulation ticks run so far
+        sim_time - the simulated game time in milliseconds, advanced by a fixed amount every tick
+
+        scheduler - the Scheduler running the game's timers, on game ticks
+        spawn_timer - the timer of the next enemy spawn, None when a spawner replaces the spawn interval
+        reload_timer - the timer ending the player's fire cooldown
+        powerup_timer - the timer ending the player's active shield or fire-rate powerup
 
-        interval_start - holds the start time of an enemy spawn interval, and resets on every spawn
         spawn_interval - the duration between enemy spawns, initially at 5 seconds
 
         max_enemies - the maximum number of enemies possible in a single frame
         enemy_vel - the travel speed of all enemies on the field
+        spawner - optional callable taking the game and the current enemy count and returning the number of enemies
+            to spawn this tick, replacing the spawn interval (set by game modes such as swarm mode)
+        invulnerable - becomes True when enemies reaching Earth are counted but do not damage it
+
+        laser_range - the distance a laser travels before it disappears
+        player_health - the health the player's ship starts the game with
+        powerup_drop_chance - the chance that an enemy destroyed by a laser drops a powerup
+
+        entities - the EntityStore holding the position, size, velocity and timer of every entity in the game
+
+        kills - the number of enemies destroyed by lasers or the zap-field powerup
+        shots_fired - the number of lasers fired by the player
+        enemies_spawned - the number of enemies spawned
+        earth_damage - the number of enemies that reached Earth
+        player_hits - the number of enemies that collided with the player's ship
+        powerups_collected - the number of powerups picked up by the player
 
         running - determines whether the game is running, and becomes False when a game-ending event occurs
         game_over - becomes True when a game-ending event occurs
@@ -92,23 +726,203 @@ class GameHandler(object):
 
     ----------
     METHODS:
-        __init__(self, width, height):
-            Creates a new game instance with initial game attributes.
+        __init__(self, seed, laser_range, player_health, powerup_drop_chance):
+            Creates a new game instance with initial game attributes, and a random seed if none is passed.
+
+        get_stats(self):
+            Gets a dictionary of the game's tick count, simulated time and gameplay counters.
     '''
-    def __init__(self):
+    def __init__(self, seed=None, laser_range=250, player_health=3, powerup_drop_chance=0.2):
         self.clock = pygame.time.Clock()
-        self.interval_start = pygame.time.get_ticks()
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        self.ticks = 0
+        self.sim_time = 0
         self.spawn_interval = 5000
 
+        self.scheduler = Scheduler()
+        self.spawn_timer = None
+        self.reload_timer = None
+        self.powerup_timer = None
+
         self.max_enemies = 5
         self.enemy_vel = 1
+        self.spawner = None
+        self.invulnerable = False
+
+        self.laser_range = laser_range
+        self.player_health = player_health
+        self.powerup_drop_chance = powerup_drop_chance
+
+        self.entities = EntityStore()
+
+        self.kills = 0
+        self.shots_fired = 0
+        self.enemies_spawned = 0
+        self.earth_damage = 0
+        self.player_hits = 0
+        self.powerups_collected = 0
 
         self.running = True
         self.game_over = False
         self.final_explosion = True
 
+    def get_stats(self):
+        return {'seed': self.seed, 'ticks': self.ticks, 'sim_seconds': self.sim_time / 1000, 'kills': self.kills,
+                'shots_fired': self.shots_fired, 'enemies_spawned': self.enemies_spawned,
+                'earth_damage': self.earth_damage, 'player_hits': self.player_hits,
+                'powerups_collected': self.powerups_collected, 'game_over': self.game_over}
+
+
+#entity store backing the game's groups until a game gives them its own, and the object pools' warm-up group
+entity_store = EntityStore()
+
 
-class PlayerShip(pygame.sprite.Sprite):
+class EntityGroup(object):
+    '''
+    CLASS DESCRIPTION:
+        An ordered group of entities whose data is kept in the group's EntityStore. Membership is tracked by store
+        slot: an entity takes a slot when it joins the group and frees it when it leaves, and belongs to at most one
+        group at a time.
+
+    ----------
+    ATTRIBUTES:
+        store - the EntityStore holding the data of every entity added to the group
+        members - the entities of the group keyed by their store slot, in the order they were added
+
+    ----------
+    METHODS:
+        __init__(self, store, *entities):
+            Creates a group backed by the passed store and adds the passed entities to it.
+
+        add(self, *entities):
+            Adds the passed entities to the group, taking a store slot for each.
+
+        remove(self, *entities):
+            Removes the passed entities from the group and frees their store slots.
+
+        empty(self):
+            Removes every entity from the group.
+
+        sprites(self):
+            Gets a list of the entities of the group.
+    '''
+    def __init__(self, store, *entities):
+        self.store = store
+        self.members = {}
+        self.add(*entities)
+
+    def add(self, *entities):
+        store = self.store
+        for entity in entities:
+            if entity.slot is None:
+                entity.store = store
+                entity.slot = store.allocate(entity.type_id, entity, self)
+                self.members[entity.slot] = entity
+            elif entity.store.groups[entity.slot] is not self:
+                raise ValueError('%s already belongs to another group' % type(entity).__name__)
+
+    def remove(self, *entities):
+        for entity in entities:
+            if entity in self:
+                del self.members[entity.slot]
+                self.store.release(entity.slot)
+                entity.slot = None
+
+    def empty(self):
+        for slot, entity in self.members.items():
+            self.store.release(slot)
+            entity.slot = None
+        self.members.clear()
+
+    def sprites(self):
+        return list(self.members.values())
+
+    def __iter__(self):
+        #iterates over a snapshot, so entities can be removed while looping
+        return iter(list(self.members.values()))
+
+    def __len__(self):
+        return len(self.members)
+
+    def __bool__(self):
+        return bool(self.members)
+
+    def __contains__(self, entity):
+        return entity.slot is not None and self.members.get(entity.slot) is entity
+
+
+class EntityView(object):
+    '''
+    CLASS DESCRIPTION:
+        The base class of every game entity. An entity is a handle on one slot of an EntityStore: its position, size
+        and previous position are read from and written to the store's arrays, and only the store and slot are kept
+        on the handle itself. The slot is taken when the entity joins a group and freed when it leaves it.
+
+    ----------
+    ATTRIBUTES:
+        type_id - the TYPE_* of the entity, set by each subclass
+
+        store - the EntityStore holding the entity's data, taken from its group
+        slot - the entity's slot index in the store, None while the entity is in no group
+
+        x, y - the coordinates of the entity
+        prev_x, prev_y - the coordinates of the entity at the start of the current tick
+        width, height - the size of the entity
+
+    ----------
+    METHODS:
+        __init__(self, *groups):
+            Creates the entity and adds it to the passed group.
+
+        alive(self):
+            Returns True while the entity is in a group.
+
+        kill(self):
+            Removes the entity from its group and frees its store slot.
+
+        save_position(self):
+            Stores the current coordinates as the previous tick's coordinates.
+
+        get_blit(self, alpha):
+            Gets the (sprite, (x, y)) pair drawing the entity's sprite interpolated by alpha (0 to 1) between the
+            previous and current tick, for batched drawing.
+    '''
+    __slots__ = ('store', 'slot')
+
+    type_id = TYPE_NONE
+
+    x = store_field('x')
+    y = store_field('y')
+    prev_x = store_field('prev_x')
+    prev_y = store_field('prev_y')
+    width = store_field('width')
+    height = store_field('height')
+
+    def __init__(self, *groups):
+        self.store = None
+        self.slot = None
+        for group in groups:
+            group.add(self)
+
+    def alive(self):
+        return self.slot is not None
+
+    def kill(self):
+        if self.slot is not None:
+            self.store.groups[self.slot].remove(self)
+
+    def save_position(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def get_blit(self, alpha=1):
+        store, slot = self.store, self.slot
+        prev_x, prev_y = store.prev_x[slot], store.prev_y[slot]
+        return (self.sprite, (prev_x + (store.x[slot] - prev_x) * alpha, prev_y + (store.y[slot] - prev_y) * alpha))
+
+
+class PlayerShip(EntityView):
     '''
     CLASS DESCRIPTION:
         A class holding the attributes of the player's ship.
@@ -121,9 +935,10 @@ class PlayerShip(pygame.sprite.Sprite):
         width - the width of the player's ship
         height - the height of the player's ship
 
-        hitbox - the rectangle created from the width and height of the player's ship that dictates collisions
+        hitbox - the rectangle created from the stored position and size of the player's ship that dictates collisions
 
-        health - the remaining health of the player's ship, initially at 3
+        health - the remaining health of the player's ship, initially at max_health
+        max_health - the health the player's ship starts with, which health_up powerups can't exceed
 
         fire_frame_count - the amount of frames that the firing sprite has been active for
         firing - boolean that becomes True during the frames that a laser is being fired
@@ -134,15 +949,16 @@ class PlayerShip(pygame.sprite.Sprite):
         vel - the travel speed of the player's ship (constant)
         shield - becomes True when a player activates a shield powerup
 
-        firing_interval - the amount of frames between laser firing for the player's ship
-        prev_fire - holds the start time of the most recent laser fire
+        firing_interval - the amount of milliseconds between laser firing for the player's ship
+        reloading - becomes True when a laser is fired, until the firing interval has passed
 
-        powerup_start_time - holds the start time of an active modifier when a powerup is activated
+        prev_x - the x-coordinate of the player's ship at the start of the current tick
+        prev_y - the y-coordinate of the player's ship at the start of the current tick
 
     ----------
     METHODS:
-        __init__(self, x, y, width, height):
-            Creates the initial player ship and adds it to the Sprite superclass. This is only done once per game.
+        __init__(self, group, x, y, width, height, health):
+            Creates the initial player ship and adds it to the passed group. This is only done once per game.
 
         set_sprite(self, sprite):
             Sets a sprite image to the player's ship.
@@ -150,9 +966,6 @@ class PlayerShip(pygame.sprite.Sprite):
         get_fire_frame_count(self):
             Gets the duration (in frames) that the firing effect sprite has been active for.
 
-        update_hitbox(self):
-            Updates the hitbox tuple with the modified instance attributes.
-
         get_stun_frame_count(self):
             Gets the amount of frames that the player has been stunned for.
 
@@ -162,23 +975,27 @@ class PlayerShip(pygame.sprite.Sprite):
         apply_powerup(self, modifier):
             Applies the passed modifier to the player's ship.
 
-        remove_powerup(self, modifier):
-            Removes the passed modifier from the player's ship.
-
-        get_powerup_start_time(self):
-            Gets the start time of the currently active modifier.        
+        remove_powerup(self):
+            Removes the shield and fire-rate modifiers from the player's ship.
 
-        redraw(self, display):
-            Draws the updated ship onto the display object.
+        redraw(self, interface, alpha):
+            Draws the updated ship onto the display object, interpolated between the previous and current tick.
     '''
+    __slots__ = ('health', 'max_health', 'sprite', 'fire_frame_count', 'firing', 'stun_frame_count', 'stunned', 'vel',
+                 'shield', 'firing_interval', 'reloading')
+
+    type_id = TYPE_PLAYER
+
     def __init__(self, group, x, y, width, height, health):
         super().__init__(group)
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.width = width
         self.height = height
-        self.hitbox = (self.x, self.y, self.width, self.height)
         self.health = health
+        self.max_health = health
 
         self.sprite = None
         self.fire_frame_count = 0
@@ -189,18 +1006,18 @@ class PlayerShip(pygame.sprite.Sprite):
         self.vel = 3
         self.shield = False
         self.firing_interval = 500
-        self.prev_fire = pygame.time.get_ticks()
-        self.powerup_start_time = 0
+        self.reloading = False
 
     def set_sprite(self, sprite):
-        self.sprite = pygame.image.load(sprite).convert_alpha()
-        self.sprite = pygame.transform.scale(self.sprite, (self.width, self.height))
+        self.sprite = asset_manager.load(sprite, (self.width, self.height))
+
+    @property
+    def hitbox(self):
+        store = self.store
+        return (store.x[self.slot], store.y[self.slot], store.width[self.slot], store.height[self.slot])
 
     def get_fire_frame_count(self):
         return self.fire_frame_count
-    
-    def update_hitbox(self):
-        self.hitbox = (self.x, self.y, self.width, self.height)
 
     def get_stun_frame_count(self):
         if self.stun_frame_count == 0:
@@ -214,16 +1031,14 @@ class PlayerShip(pygame.sprite.Sprite):
     def apply_powerup(self, modifier):
         if modifier == 'bubble_shield':
             self.shield = True
-            self.powerup_duration = pygame.time.get_ticks()
             return
 
         elif modifier == 'fire_rate':
             self.firing_interval /= 2
-            self.powerup_duration = pygame.time.get_ticks()
             return
 
         elif modifier == 'health_up':
-            if self.health < 3:
+            if self.health < self.max_health:
                 self.health += 1
             return
             
@@ -232,18 +1047,14 @@ class PlayerShip(pygame.sprite.Sprite):
         return
     
     def remove_powerup(self):
-        self.powerup_start_time = 0
         self.shield = False
         self.firing_interval = 500
 
-    def get_powerup_start_time(self):
-        return self.powerup_start_time
-
-    def redraw(self, interface):
-        interface.display.blit(self.sprite, (self.x, self.y))
+    def redraw(self, interface, alpha=1):
+        interface.redraw(self.sprite, self.prev_x + (self.x - self.prev_x) * alpha, self.prev_y + (self.y - self.prev_y) * alpha)
 
 
-class EnemyShip(pygame.sprite.Sprite):
+class EnemyShip(EntityView):
     '''
     CLASS DESCRIPTION:
         An object class for instances of enemy ships.
@@ -256,45 +1067,54 @@ class EnemyShip(pygame.sprite.Sprite):
         width - the width of the enemy ship
         height - the height of the enemy ship
 
-        hitbox - the rectangle created from the width and height of the enemy ship that dictates collisions
+        hitbox - the rectangle created from the stored position and size of the enemy ship that dictates collisions
+
+        vel - the travel speed of the enemy ship, stored as its y-velocity and applied to every enemy at once
+
+        prev_x - the x-coordinate of the enemy ship at the start of the current tick
+        prev_y - the y-coordinate of the enemy ship at the start of the current tick
 
     ----------
     METHODS:
         __init__(self, x, y, width, height):
-            Creates an instance of the enemy ship and adds it to the Sprite superclass. Done once per enemy ship spawn.
+            Creates an instance of the enemy ship and adds it to the passed group. Done once per enemy ship spawn.
 
         set_sprite(self, sprite):
             Sets a sprite image to the enemy ship, selected from a list of enemy sprites.
 
-        update_hitbox(self):
-            Updates the hitbox tuple with the modified instance attributes.
-
-        redraw(self, display):
-            Draws the updated enemy ship onto the display object.        
+        redraw(self, interface, alpha):
+            Draws the updated enemy ship onto the display object, interpolated between the previous and current tick.
     '''
+    __slots__ = ('sprite',)
+
+    type_id = TYPE_ENEMY
+    vel = store_field('vel_y')
+
     def __init__(self, group, x, y, width, height):
         super().__init__(group)
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.width = width
         self.height = height
-        self.hitbox = (self.x, self.y, self.width, self.height)
         self.sprite = None
         self.vel = 1
 
-    def set_sprite(self, sprite):
-        self.sprite = pygame.image.load(sprite).convert_alpha()
-        self.sprite = pygame.transform.scale(self.sprite, (self.width, self.height))
+    @property
+    def hitbox(self):
+        store = self.store
+        return (store.x[self.slot], store.y[self.slot], store.width[self.slot], store.height[self.slot])
 
-    def update_hitbox(self):
-        self.hitbox = (self.x, self.y, self.width, self.height)
+    def set_sprite(self, sprite):
+        self.sprite = asset_manager.load(sprite, (self.width, self.height))
 
-    def redraw(self, interface):
-        interface.display.blit(self.sprite, (self.x, self.y))
+    def redraw(self, interface, alpha=1):
+        interface.redraw(self.sprite, self.prev_x + (self.x - self.prev_x) * alpha, self.prev_y + (self.y - self.prev_y) * alpha)
         
 
 
-class Laser(pygame.sprite.Sprite):
+class Laser(EntityView):
     '''
     CLASS DESCRIPTION:
         An object class for instances of laser beams being fired.
@@ -306,16 +1126,22 @@ class Laser(pygame.sprite.Sprite):
         init_y - the initial y-coordinate of the laser, used to 
 
         width - the width of the laser, which dictates its hitbox
-        vel - the velocity of the laser (constant)
+        vel - the velocity of the laser (constant), stored as its negative y-velocity and applied to every laser at once
 
         hit - boolean that turns True upon collision with an enemy
 
         sprite - holds the image of the laser to be displayed
 
+        prev_x - the x-coordinate of the laser at the start of the current tick
+        prev_y - the y-coordinate of the laser at the start of the current tick
+
     ----------
     METHODS:
-        __init__(self, x, y, vel):
-            Creates an instance of the laser beam and adds it to the Sprite superclass. Done once per laser fired.
+        __init__(self, group, x, y, width, height, vel, sprite):
+            Creates an instance of the laser beam and adds it to the passed group.
+
+        reset(self, x, y, width, height, vel, sprite):
+            Re-initializes the laser beam, so a pooled instance can be fired again.
 
         set_sprite(self, sprite):
             Sets a sprite image to the laser beam.
@@ -323,89 +1149,136 @@ class Laser(pygame.sprite.Sprite):
         get_travel(self):
             Gets the distance traveled by the laser.
 
-        redraw(self, display):
-            Draws the updated laser onto the display object.
+        redraw(self, interface, alpha):
+            Draws the updated laser onto the display object, interpolated between the previous and current tick.
     '''
+    __slots__ = ('init_y', 'vel', 'hit', 'sprite')
+
+    type_id = TYPE_LASER
+
     def __init__(self, group, x, y, width, height, vel, sprite):
         super().__init__(group)
+        self.reset(x, y, width, height, vel, sprite)
+
+    def reset(self, x, y, width, height, vel, sprite):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.init_y = y
         self.width = width
         self.height = height
         self.vel = vel
+        self.store.vel_y[self.slot] = -vel
         self.hit = False
         self.set_sprite(sprite)
 
     def set_sprite(self, sprite):
-        self.sprite = pygame.image.load(sprite).convert_alpha()
-        self.sprite = pygame.transform.scale(self.sprite, (self.width, 15))
+        self.sprite = asset_manager.load(sprite, (self.width, 15))
 
     def get_travel(self):
         return abs(self.y - self.init_y)
 
-    def redraw(self, interface):
-        interface.display.blit(self.sprite, (self.x, self.y))
+    def redraw(self, interface, alpha=1):
+        interface.redraw(self.sprite, self.prev_x + (self.x - self.prev_x) * alpha, self.prev_y + (self.y - self.prev_y) * alpha)
 
 
 
-class Explosion(pygame.sprite.Sprite):
+class Animation(object):
     '''
     CLASS DESCRIPTION:
-        An object class for instances of explosions that occur after collisions.
+        A shared animation frame table. Every frame is decoded and scaled once when the animation is created, and any
+        number of animated objects pick their current frame from it by elapsed time - no per-object sprite state.
+
+    ----------
+    ATTRIBUTES:
+        frames - the decoded and scaled frame surfaces, in playback order
+        size - the (width, height) every frame is scaled to
+        frame_ticks - the number of ticks each frame is shown for, may be fractional
+        duration - the total length of the animation in ticks
+
+    ----------
+    METHODS:
+        __init__(self, paths, size, frame_ticks):
+            Decodes and scales the frame images at the passed paths into the frame table.
+
+        get_frame(self, elapsed):
+            Gets the frame to show elapsed ticks after the animation started, the last frame once it is over.
+
+        is_finished(self, elapsed):
+            Returns True once elapsed ticks cover the whole animation.
+    '''
+    def __init__(self, paths, size, frame_ticks):
+        self.size = (int(size[0]), int(size[1]))
+        self.frames = tuple(asset_manager.load(path, self.size) for path in paths)
+        self.frame_ticks = frame_ticks
+        self.duration = len(self.frames) * frame_ticks
+
+    def get_frame(self, elapsed):
+        #elapsed may be fractional, e.g. interpolated render time, so playback does not depend on the tick rate
+        index = int(elapsed // self.frame_ticks)
+        return self.frames[min(max(index, 0), len(self.frames) - 1)]
+
+    def is_finished(self, elapsed):
+        return elapsed >= self.duration
+
+
+class Explosion(EntityView):
+    '''
+    CLASS DESCRIPTION:
+        An object class for instances of explosions that occur after collisions. An explosion is only a position and
+        a start tick - its current frame comes from the shared animation and the time elapsed since it started.
 
     ----------
     ATTRIBUTES:
         x - the x-coordinate of the explosion
         y - the y-coordinate of the explosion
 
-        width - the width of the explosion
-        height - the height of the explosion
+        width - the width of the explosion, taken from the animation's frame size
+        height - the height of the explosion, taken from the animation's frame size
 
-        frame_count - hold the number of frames that the current sprite has been active for
-        sprites - a list of sprites that create the explosion animation
-        index - the index of the current sprite in sprites list
-        curr_sprite - holds the current image of the explosion to be displayed
+        animation - the shared Animation played by the explosion
+        start_tick - the game tick the explosion started on, kept in the store's timer
 
     ----------
     METHODS:
-        __init__(self, group, x, y, width, height, sprites, duration):
-            Creates an instance of an explosion and adds it to the Sprite superclass. Done once per enemy removal.
+        __init__(self, group, x, y, animation, start_tick):
+            Creates an instance of an explosion and adds it to the passed group.
 
-        get_frame_count(self):
-            Gets the duration (in frames) that the individual explosion sprite has been active for.
+        reset(self, x, y, animation, start_tick):
+            Re-initializes the explosion from the start of its animation, so a pooled instance can be played again.
 
-        next_sprite(self):
-            Sets the next sprite of the explosion to continue the animation.
+        get_blit(self, elapsed):
+            Gets the (frame, (x, y)) pair drawing the animation frame shown elapsed ticks after the explosion started.
 
-        redraw(self, interface):
-            Draws the updated explosion onto the display object.
+        redraw(self, interface, elapsed):
+            Draws the animation frame shown elapsed ticks after the explosion started onto the display object.
     '''
-    def __init__(self, group, x, y, width, height, sprites, duration):
+    __slots__ = ('animation',)
+
+    type_id = TYPE_EXPLOSION
+    start_tick = store_field('timer')
+
+    def __init__(self, group, x, y, animation, start_tick):
         super().__init__(group)
+        self.reset(x, y, animation, start_tick)
+
+    def reset(self, x, y, animation, start_tick):
         self.x = x
         self.y = y
-        self.width = width
-        self.height = height
+        self.width, self.height = animation.size
 
-        self.frame_count = 0
-        self.sprites = sprites
-        self.index = 0
-        self.curr_sprite = pygame.image.load(self.sprites[self.index]).convert_alpha()
+        self.animation = animation
+        self.start_tick = start_tick
 
-    def get_frame_count(self):
-        return self.frame_count
-        
-    def next_sprite(self):
-        self.index += 1
-        self.curr_sprite = pygame.image.load(self.sprites[self.index]).convert_alpha()
-        self.frame_count = 0
+    def get_blit(self, elapsed):
+        return (self.animation.get_frame(elapsed), (self.x, self.y))
 
-    def redraw(self, interface):
-        interface.display.blit(self.curr_sprite, (self.x, self.y))
+    def redraw(self, interface, elapsed):
+        interface.redraw(self.animation.get_frame(elapsed), self.x, self.y)
 
 
-class PowerUp(pygame.sprite.Sprite):
+class PowerUp(EntityView):
     '''
     CLASS DESCRIPTION:
         An object class for instances of powerups that have a chance to spawn after eliminated enemies.
@@ -418,18 +1291,21 @@ class PowerUp(pygame.sprite.Sprite):
         width - the width of the powerup
         height - the height of the powerup
 
-        hitbox - the rectangle created from the width and height of the powerup that dictates collisions
+        hitbox - the rectangle created from the stored position and size of the powerup that dictates collisions
 
         modifier - the type of powerup being created
         sprite - holds the image of the powerup to be displayed
 
-        frame_count - the total duration (in frames) that the powerup will appear on the field for
+        frame_count - the total duration (in frames) that the powerup will appear on the field for, kept in the store's timer
         flashing - boolean that turns True if the powerup is about to despawn
 
     ----------
     METHODS:
-        __init__(self, group, x, y, width, height, sprites, duration):
-            Creates an instance of a powerup and adds it to the Sprite superclass. Done once per powerup spawn.
+        __init__(self, group, x, y, width, height, modifier, sprite, frames):
+            Creates an instance of a powerup and adds it to the passed group.
+
+        reset(self, x, y, width, height, modifier, sprite, frames):
+            Re-initializes the powerup, so a pooled instance can be spawned again.
 
         set_sprite(self, sprite):
             Sets a sprite image to the powerup, determined by its modifier.
@@ -443,13 +1319,20 @@ class PowerUp(pygame.sprite.Sprite):
         redraw(self, interface):
             Draws the updated powerup onto the display object.
     '''
+    __slots__ = ('modifier', 'sprite', 'flashing')
+
+    type_id = TYPE_POWERUP
+    frame_count = store_field('timer')
+
     def __init__(self, group, x, y, width, height, modifier, sprite, frames):
         super().__init__(group)
+        self.reset(x, y, width, height, modifier, sprite, frames)
+
+    def reset(self, x, y, width, height, modifier, sprite, frames):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
-        self.hitbox = (self.x, self.y, self.width, self.height)
 
         self.modifier = modifier
         self.set_sprite(sprite)
@@ -457,9 +1340,13 @@ class PowerUp(pygame.sprite.Sprite):
         self.frame_count = frames
         self.flashing = False
 
+    @property
+    def hitbox(self):
+        store = self.store
+        return (store.x[self.slot], store.y[self.slot], store.width[self.slot], store.height[self.slot])
+
     def set_sprite(self, sprite):
-        self.sprite = pygame.image.load(sprite).convert_alpha()
-        self.sprite = pygame.transform.scale(self.sprite, (self.width, self.height))
+        self.sprite = asset_manager.load(sprite, (self.width, self.height))
 
     def get_frame_count(self):
         if self.frame_count == 0:
@@ -470,5 +1357,87 @@ class PowerUp(pygame.sprite.Sprite):
         self.flashing = True
 
     def redraw(self, interface):
-        interface.display.blit(self.sprite, (self.x, self.y))
+        interface.redraw(self.sprite, self.x, self.y)
+
+
+class ObjectPool(object):
+    '''
+    CLASS DESCRIPTION:
+        A pool of reusable sprite instances of a single class (Laser, Explosion or PowerUp). Released instances are
+        reset and reactivated by the next acquire instead of constructing new ones.
+
+    ----------
+    ATTRIBUTES:
+        factory - the sprite class the pool holds, which must provide a reset method taking its constructor arguments
+        cap - the maximum number of instances the pool creates and keeps
+
+        free - the released instances waiting to be reused
+
+        created - the number of pooled instances constructed
+        reused - the number of acquires served from the free list
+        exhausted - the number of acquires made while every pooled instance was in use, served by a new unpooled instance
+        discarded - the number of released instances dropped because the free list was full
+
+    ----------
+    METHODS:
+        __init__(self, factory, cap):
+            Creates an empty pool for the passed sprite class.
+
+        prewarm(self, count, *args):
+            Constructs up to count instances ahead of time with the passed constructor arguments.
+
+        acquire(self, group, *args):
+            Gets an instance reset with the passed arguments and added to the group, reusing a free one when possible.
+
+        release(self, obj):
+            Removes an instance from all of its groups and returns it to the free list.
+
+        get_stats(self):
+            Gets a dictionary of the pool counters.
+    '''
+    def __init__(self, factory, cap):
+        self.factory = factory
+        self.cap = cap
+        self.free = []
+
+        self.created = 0
+        self.reused = 0
+        self.exhausted = 0
+        self.discarded = 0
+
+    def prewarm(self, count, *args):
+        holding_group = EntityGroup(entity_store)
+        while len(self.free) < count and self.created < self.cap:
+            obj = self.factory(holding_group, *args)
+            obj.kill()
+            self.created += 1
+            self.free.append(obj)
+
+    def acquire(self, group, *args):
+        if self.free:
+            obj = self.free.pop()
+            group.add(obj)
+            obj.reset(*args)
+            self.reused += 1
+            return obj
+
+        if self.created < self.cap:
+            self.created += 1
+        else:
+            self.exhausted += 1
+        return self.factory(group, *args)
+
+    def release(self, obj):
+        #instances already released (no longer in any group) are ignored
+        if not obj.alive():
+            return
+
+        obj.kill()
+        if len(self.free) < self.cap:
+            self.free.append(obj)
+        else:
+            self.discarded += 1
 
+    def get_stats(self):
+        return {'created': self.created, 'reused': self.reused, 'exhausted': self.exhausted,
+                'discarded': self.discarded, 'free': len(self.free)}
@@ -0,0 +1,445 @@
+#NumPy is optional - the batch collision engine falls back to per-pair tests without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+#----------NARROW PHASE----------
+def is_collision(object1, object2):
+    '''Checks if a collision between 2 game objects has occurred. Returns true on collision. Hitboxes determine the object type.'''
+
+    #PROJECTILE -> OBJECT
+    if hasattr(object1, 'hitbox') == False and hasattr(object2, 'hitbox') == True:
+
+        #y-values check
+        if object1.y < object2.hitbox[1] + object2.hitbox[3] and object1.y + object1.height > object2.hitbox[1]:
+
+            #x-values check
+            if object1.x > object2.hitbox[0] and object1.x + object1.width < object2.hitbox[0] + object2.hitbox[2]:
+                return True
+
+        return False
+
+
+    #OBJECT -> OBJECT
+    else:
+        #y-values check
+        #object 1 collision from positive y
+        if object1.hitbox[1] < object2.hitbox[1] + object2.hitbox[3] and object1.hitbox[1] > object2.hitbox[1]:
+
+            #x-values check
+            if object1.hitbox[0] < object2.hitbox[0] + object2.hitbox[2] and object1.hitbox[0] + object1.hitbox[2] > object2.hitbox[0]:
+                return True
+
+        #object 1 collision from negative y
+        elif object1.hitbox[1] + object1.hitbox[3] > object2.hitbox[1] and object1.hitbox[1] < object2.hitbox[1]:
+
+            #x-values check
+            if object1.hitbox[0] < object2.hitbox[0] + object2.hitbox[2] and object1.hitbox[0] + object1.hitbox[2] > object2.hitbox[0]:
+                return True
+
+        return False
+
+
+def get_bounds(entity):
+    '''Gets the (x, y, width, height) box of a game object - its hitbox for objects, its position and size for projectiles.'''
+    #hitbox is a property on most objects, so it is only computed once
+    hitbox = getattr(entity, 'hitbox', None)
+    if hitbox is not None:
+        return hitbox
+    return (entity.x, entity.y, entity.width, entity.height)
+
+
+def get_displacement(entity):
+    '''Gets the (dx, dy) distance a game object moves per tick - its velocity in its EntityStore, or (0, 0) outside a store.'''
+    store = getattr(entity, 'store', None)
+    if store is None:
+        return (0, 0)
+    return (store.vel_x[entity.slot], store.vel_y[entity.slot])
+
+
+def get_swept_bounds(bounds, displacement):
+    '''Gets the (x, y, width, height) box covering an (x, y, width, height) box over its whole move by a (dx, dy) displacement.'''
+    x, y, width, height = bounds
+    dx, dy = displacement
+    return (min(x, x + dx), min(y, y + dy), width + abs(dx), height + abs(dy))
+
+
+def swept_collision_time(bounds, displacement, object_bounds):
+    '''
+    Gets the earliest fraction of its move, in [0, 1), at which a projectile box moving by a (dx, dy) displacement collides
+    with a still object box under the PROJECTILE -> OBJECT rules of is_collision. Returns None if the whole move misses.
+    A projectile that doesn't move collides exactly when is_collision does, at time 0.
+    '''
+    x, y, width, height = bounds
+    dx, dy = displacement
+    ox, oy, ow, oh = object_bounds
+    entry = 0.0
+    exit = 1.0
+
+    #every is_collision rule is a strict inequality start + move * t < limit, which holds up to or from one crossing time
+    #the x-rules go first, as most objects near a projectile are beside it rather than in its path
+    for start, move, limit in ((-x, -dx, -ox), (x + width, dx, ox + ow), (y, dy, oy + oh), (-y - height, -dy, -oy)):
+        if move == 0:
+            if start >= limit:
+                return None
+        elif move > 0:
+            exit = min(exit, (limit - start) / move)
+        else:
+            entry = max(entry, (limit - start) / move)
+
+    if entry < exit:
+        return entry
+    return None
+
+
+#----------BROAD PHASE----------
+class SpatialHash(object):
+    '''
+    CLASS DESCRIPTION:
+        A uniform grid broadphase that buckets game objects by cell, so that the narrow-phase collision test
+        only runs on pairs of objects sharing a cell.
+
+    ----------
+    ATTRIBUTES:
+        cell_size - the width and height of a single grid cell
+
+        cells - mapping of (column, row) cells to the list of objects overlapping that cell
+        order - mapping of every inserted object to its insertion index, used to keep query results in group order
+        entity_cells - mapping of every inserted object to the cells it was added to
+        inserted - the number of objects inserted since the grid was last cleared
+
+        pair_tests - the number of narrow-phase tests run since the grid was last built
+        brute_force_tests - the number of narrow-phase tests a check against every object would have run
+
+    ----------
+    METHODS:
+        __init__(self, cell_size):
+            Creates an empty grid with the passed cell size.
+
+        clear(self):
+            Removes every object from the grid and resets the pair-test counters.
+
+        build(self, entities):
+            Clears the grid and inserts every object of the passed group. Done once per frame.
+
+        get_cells(self, bounds):
+            Gets the (column, row) cells overlapped by an (x, y, width, height) box.
+
+        insert(self, entity):
+            Adds an object to every cell overlapped by its bounds.
+
+        remove(self, entity):
+            Removes an object from every cell it was added to.
+
+        query(self, entity):
+            Gets the objects sharing at least one cell with the passed object, in insertion order.
+
+        query_bounds(self, bounds):
+            Gets the objects sharing at least one cell with an (x, y, width, height) box, in insertion order.
+
+        first_collision(self, entity):
+            Gets the first object in insertion order colliding with the passed object, or None.
+
+        first_swept_collision(self, entity):
+            Gets the object the passed projectile hits earliest over its move this tick, or None. Ties go to the
+            first object in insertion order.
+
+        all_collisions(self, entity):
+            Gets every object colliding with the passed object, in insertion order.
+
+        get_stats(self):
+            Gets a dictionary of the grid size and pair-test counters.
+    '''
+    def __init__(self, cell_size=100):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.order = {}
+        self.entity_cells = {}
+        self.inserted = 0
+
+        self.pair_tests = 0
+        self.brute_force_tests = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.order.clear()
+        self.entity_cells.clear()
+        self.inserted = 0
+        self.pair_tests = 0
+        self.brute_force_tests = 0
+
+    def build(self, entities):
+        self.clear()
+        for entity in entities:
+            self.insert(entity)
+
+    def get_cells(self, bounds):
+        x, y, width, height = bounds
+        col_start = int(x // self.cell_size)
+        col_end = int((x + width) // self.cell_size)
+        row_start = int(y // self.cell_size)
+        row_end = int((y + height) // self.cell_size)
+
+        return [(col, row) for col in range(col_start, col_end + 1) for row in range(row_start, row_end + 1)]
+
+    def insert(self, entity):
+        cells = self.get_cells(get_bounds(entity))
+        self.order[entity] = self.inserted
+        self.inserted += 1
+        self.entity_cells[entity] = cells
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(entity)
+
+    def remove(self, entity):
+        if entity not in self.order:
+            return
+
+        del self.order[entity]
+        for cell in self.entity_cells.pop(entity):
+            self.cells[cell].remove(entity)
+
+    def query(self, entity):
+        return self.query_bounds(get_bounds(entity))
+
+    def query_bounds(self, bounds):
+        candidates = set()
+        for cell in self.get_cells(bounds):
+            bucket = self.cells.get(cell)
+            if bucket:
+                candidates.update(bucket)
+
+        return sorted(candidates, key=self.order.__getitem__)
+
+    def first_collision(self, entity):
+        self.brute_force_tests += len(self.order)
+        for candidate in self.query(entity):
+            self.pair_tests += 1
+            if is_collision(entity, candidate):
+                return candidate
+        return None
+
+    def first_swept_collision(self, entity):
+        bounds = get_bounds(entity)
+        displacement = get_displacement(entity)
+        self.brute_force_tests += len(self.order)
+
+        #only the cells the projectile passes through can hold what it hits
+        first = None
+        first_time = None
+        for candidate in self.query_bounds(get_swept_bounds(bounds, displacement)):
+            self.pair_tests += 1
+            time = swept_collision_time(bounds, displacement, get_bounds(candidate))
+            if time is not None and (first_time is None or time < first_time):
+                first = candidate
+                first_time = time
+        return first
+
+    def all_collisions(self, entity):
+        self.brute_force_tests += len(self.order)
+        collisions = []
+        for candidate in self.query(entity):
+            self.pair_tests += 1
+            if is_collision(entity, candidate):
+                collisions.append(candidate)
+        return collisions
+
+    def get_stats(self):
+        return {'cells': len(self.cells), 'entities': len(self.order),
+                'pair_tests': self.pair_tests, 'brute_force_tests': self.brute_force_tests}
+
+
+#----------BATCH ENGINE----------
+def get_box_array(entities):
+    '''Gets an (N, 4) array of the (x, y, width, height) boxes of the passed game objects.'''
+    #entities sharing an EntityStore are gathered straight from its arrays by slot
+    store = getattr(entities[0], 'store', None) if entities else None
+    if store is not None and all(entity.store is store for entity in entities):
+        slots = numpy.fromiter((entity.slot for entity in entities), dtype=numpy.intp, count=len(entities))
+        return numpy.column_stack([store.view(field)[slots] for field in ('x', 'y', 'width', 'height')])
+
+    boxes = numpy.empty((len(entities), 4), dtype=numpy.float64)
+    for i, entity in enumerate(entities):
+        boxes[i] = get_bounds(entity)
+    return boxes
+
+
+def get_displacement_array(entities):
+    '''Gets an (N, 2) array of the (dx, dy) per-tick displacements of the passed game objects.'''
+    store = getattr(entities[0], 'store', None) if entities else None
+    if store is not None and all(entity.store is store for entity in entities):
+        slots = numpy.fromiter((entity.slot for entity in entities), dtype=numpy.intp, count=len(entities))
+        return numpy.column_stack([store.view('vel_x')[slots], store.view('vel_y')[slots]])
+
+    displacements = numpy.empty((len(entities), 2), dtype=numpy.float64)
+    for i, entity in enumerate(entities):
+        displacements[i] = get_displacement(entity)
+    return displacements
+
+
+def batch_collisions(projectile_boxes, object_boxes):
+    '''
+    Gets the (projectiles x objects) boolean hit matrix from a single vectorized AABB test, using the
+    PROJECTILE -> OBJECT rules of is_collision: overlapping y-ranges, and the projectile fully inside the object's x-range.
+    '''
+    px = projectile_boxes[:, 0, None]
+    py = projectile_boxes[:, 1, None]
+    pw = projectile_boxes[:, 2, None]
+    ph = projectile_boxes[:, 3, None]
+
+    ox = object_boxes[None, :, 0]
+    oy = object_boxes[None, :, 1]
+    ow = object_boxes[None, :, 2]
+    oh = object_boxes[None, :, 3]
+
+    return (py < oy + oh) & (py + ph > oy) & (px > ox) & (px + pw < ox + ow)
+
+
+def batch_swept_times(projectile_boxes, displacements, object_boxes):
+    '''
+    Gets the (projectiles x objects) matrix of swept_collision_time for every pair at once, with infinity where a
+    projectile misses an object over its whole move.
+    '''
+    times = numpy.full((len(projectile_boxes), len(object_boxes)), numpy.inf)
+
+    #the box each projectile sweeps over its move - only pairs where it touches the object can hit
+    swept_boxes = projectile_boxes.copy()
+    swept_boxes[:, :2] += numpy.minimum(displacements, 0)
+    swept_boxes[:, 2:] += numpy.abs(displacements)
+    rows, columns = numpy.nonzero((swept_boxes[:, 1, None] <= object_boxes[None, :, 1] + object_boxes[None, :, 3]) &
+                                  (swept_boxes[:, 1, None] + swept_boxes[:, 3, None] >= object_boxes[None, :, 1]) &
+                                  (swept_boxes[:, 0, None] <= object_boxes[None, :, 0] + object_boxes[None, :, 2]) &
+                                  (swept_boxes[:, 0, None] + swept_boxes[:, 2, None] >= object_boxes[None, :, 0]))
+    if not rows.size:
+        return times
+
+    px, py, pw, ph = projectile_boxes[rows].T
+    dx, dy = displacements[rows].T
+    ox, oy, ow, oh = object_boxes[columns].T
+
+    #each axis holds while low < move * t < high - dividing by a zero move gives infinite times where the projectile
+    #always overlaps, and NaN (which compares false) where it only touches, as in is_collision
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+
+        #y-ranges overlap
+        low = (oy - py - ph) / dy
+        high = (oy + oh - py) / dy
+        entry = numpy.maximum(numpy.minimum(low, high), 0)
+        exit = numpy.minimum(numpy.maximum(low, high), 1)
+
+        #projectile inside the object's x-range, which it can't be if it is wider
+        low = (ox - px) / dx
+        high = (ox + ow - pw - px) / dx
+        entry = numpy.maximum(entry, numpy.minimum(low, high))
+        exit = numpy.minimum(exit, numpy.maximum(low, high))
+
+        hit = (entry < exit) & (ow > pw)
+
+    times[rows[hit], columns[hit]] = entry[hit]
+    return times
+
+
+def first_hits(hit_matrix):
+    '''Gets the index of the first object hit by each projectile, or -1 where a projectile hits nothing.'''
+    hits = numpy.argmax(hit_matrix, axis=1)
+    hits[~hit_matrix.any(axis=1)] = -1
+    return hits
+
+
+def resolve_hits(hit_matrix):
+    '''
+    Gets the index of the object destroyed by each projectile, or -1. Projectiles are resolved in order and
+    each object can only be destroyed once, matching the sequential laser loop.
+    '''
+    hits = numpy.full(hit_matrix.shape[0], -1, dtype=numpy.intp)
+    taken = numpy.zeros(hit_matrix.shape[1], dtype=bool)
+
+    #only the projectiles that hit something need resolving
+    for row in numpy.flatnonzero(hit_matrix.any(axis=1)):
+        candidates = numpy.flatnonzero(hit_matrix[row] & ~taken)
+        if candidates.size:
+            hits[row] = candidates[0]
+            taken[candidates[0]] = True
+
+    return hits
+
+
+def resolve_swept_hits(hit_times):
+    '''
+    Gets the index of the object destroyed by each projectile from a batch_swept_times matrix, or -1. Projectiles are
+    resolved in order and each destroys the object it reaches earliest that no earlier projectile destroyed.
+    '''
+    hits = numpy.full(hit_times.shape[0], -1, dtype=numpy.intp)
+    taken = numpy.zeros(hit_times.shape[1], dtype=bool)
+
+    #only the projectiles that hit something need resolving
+    hit_matrix = numpy.isfinite(hit_times)
+    for row in numpy.flatnonzero(hit_matrix.any(axis=1)):
+        candidates = numpy.flatnonzero(hit_matrix[row] & ~taken)
+        if candidates.size:
+
+            #argmin picks the first object in group order among equally early hits
+            column = candidates[numpy.argmin(hit_times[row, candidates])]
+            hits[row] = column
+            taken[column] = True
+
+    return hits
+
+
+def find_first_hits(projectiles, objects):
+    '''
+    Gets a dictionary mapping each projectile to the object it destroys, resolved in group order. Projectiles are swept
+    over their move this tick and destroy the object they reach earliest.
+    '''
+    projectiles = list(projectiles)
+    objects = list(objects)
+    if not projectiles or not objects:
+        return {}
+
+    #fall back to the per-pair test without NumPy
+    if numpy is None:
+        hits = {}
+        remaining = list(objects)
+        for projectile in projectiles:
+            bounds = get_bounds(projectile)
+            displacement = get_displacement(projectile)
+            first = None
+            first_time = None
+            for obj in remaining:
+                time = swept_collision_time(bounds, displacement, get_bounds(obj))
+                if time is not None and (first_time is None or time < first_time):
+                    first = obj
+                    first_time = time
+            if first is not None:
+                hits[projectile] = first
+                remaining.remove(first)
+        return hits
+
+    hit_times = batch_swept_times(get_box_array(projectiles), get_displacement_array(projectiles), get_box_array(objects))
+    hit_indices = resolve_swept_hits(hit_times)
+    return {projectiles[i]: objects[hit_indices[i]] for i in numpy.flatnonzero(hit_indices >= 0)}
+
+
+def find_store_collisions(store, type_id, box, min_y=None):
+    '''
+    Gets the store slots of every type_id entity colliding with box, using the OBJECT -> OBJECT rules of is_collision,
+    or lying at or below min_y. Runs over the store arrays at once. Returns None without NumPy.
+    '''
+    if numpy is None:
+        return None
+
+    x = store.view('x')
+    y = store.view('y')
+    width = store.view('width')
+    height = store.view('height')
+    bx, by, bw, bh = box
+
+    #box collision from positive y or from negative y, as in is_collision
+    overlap_x = (bx < x + width) & (bx + bw > x)
+    overlap_y = ((by < y + height) & (by > y)) | ((by + bh > y) & (by < y))
+    selected = overlap_x & overlap_y
+    if min_y is not None:
+        selected |= y >= min_y
+
+    return numpy.flatnonzero(selected & (store.view('type_id') == type_id))
@@ -3,17 +3,55 @@ from pygame.locals import *
 
 #custom game class module
 from classes import *
+from collision import SpatialHash, is_collision, find_first_hits, find_store_collisions
+from profiler import FrameProfiler
+from sound import SoundEngine
 
 import sys
 import os
+import time
+import math
 import random
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 #----------GAME CONSTANTS----------
-#interface
+#interface - the game is laid out in DISPLAY_WIDTH x DISPLAY_HEIGHT game coordinates
 DISPLAY_WIDTH = 900
 DISPLAY_HEIGHT = 600
+RENDER_SCALE = 1            #internal resolution as a fraction of the game coordinates - lower it on slow machines
+DISPLAY_FULLSCREEN = False  #the internal resolution is stretched to the window, or to the whole screen
 BLACK = (0, 0, 0)
+HEALTHBAR_WIDTH = 175
+HEALTHBAR_HEIGHT = 75
+DIRTY_RECT_RENDERING = False
+
+#render layers - the render queue draws lower layers first
+LAYER_PLAYER = 0
+LAYER_LASERS = 1
+LAYER_POWERUPS = 2
+LAYER_ENEMIES = 3
+LAYER_EXPLOSIONS = 4
+
+#asset loading - images come from the ASSET_BUNDLE_PATH bundle (built with bundle.py) when it exists,
+#otherwise they are decoded on ASSET_PRELOAD_WORKERS threads behind a loading screen
+ASSET_BUNDLE_PATH = 'assets.bundle'
+ASSET_PRELOAD_WORKERS = 4
+LOADING_BAR_WIDTH = 400
+LOADING_BAR_HEIGHT = 20
+LOADING_BAR_COLOR = (255, 255, 255)
+
+#game loop - the simulation runs at a fixed TICK_RATE, and all *_FRAMES durations below count simulation ticks
+TICK_RATE = 90
+TICK_TIME = 1000 / TICK_RATE
+MAX_FPS = 0                 #render frame rate cap, 0 renders as fast as the machine allows
+MAX_FRAME_TIME = 250        #longest real frame time (ms) simulated in one go, past that the game slows down instead
+
+#frame profiler - F3 toggles the overlay, F4 writes the trace file
+PROFILER_ENABLED = False
+PROFILER_TRACE_PATH = 'trace.json'
 
 #player ship
 PLAYER_WIDTH = 50
@@ -22,7 +60,14 @@ PLAYER_HEALTH = 3
 FIRING_FRAMES = 9
 STUN_BLIT_RATE = 30
 STUN_FRAME_DURATION = 240
-PLAYER_POWERUP_DURATION = 15
+PLAYER_POWERUP_DURATION = 15        #seconds a shield or fire-rate powerup lasts
+
+#player input - one bit per action, so a tick's input fits in a single byte
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_UP = 4
+INPUT_DOWN = 8
+INPUT_FIRE = 16
 
 #enemy ships
 ENEMY_WIDTH = 50
@@ -37,7 +82,28 @@ LASER_VEL = 5
 #explosions
 EXPLOSION_WIDTH = 75
 EXPLOSION_HEIGHT = 75
-EXPLOSION_FRAMES = 3
+EXPLOSION_FRAMES = 3       #each animation frame is shown for EXPLOSION_FRAMES + 1 ticks
+
+#swarm mode (see swarm.py) - enemies spawned per second follow the SWARM_CURVE spawn curve
+SWARM_CURVE = 'linear'
+SWARM_SPAWN_RATE = 20       #enemies per second at the start of the game
+SWARM_SPAWN_GROWTH = 5      #spawn curve growth - for 'linear', extra enemies per second gained every second
+SWARM_MAX_ENEMIES = 3000
+SWARM_ENEMY_VEL = 0.25
+SWARM_TARGET_FPS = 60
+
+#reinforcement-learning environment (see environment.py)
+ENV_FRAME_SKIP = 4          #ticks simulated per step, holding the same action
+ENV_OBSERVED_ENEMIES = 8    #enemies closest to Earth in the state vector
+ENV_OBSERVED_POWERUPS = 2
+ENV_FRAME_SIZE = (84, 84)   #size of the downscaled frame observations
+ENV_KILL_REWARD = 1.0
+ENV_EARTH_PENALTY = 1.0     #subtracted for every enemy reaching Earth
+ENV_LOSS_PENALTY = 5.0      #subtracted once when the game is lost
+
+#collisions
+COLLISION_CELL_SIZE = 100
+COLLISION_MODE = 'grid'     #'grid' for the spatial-hash broadphase, 'batch' for the vectorized NumPy engine
 
 #powerups
 POWERUP_WIDTH = 25
@@ -47,6 +113,15 @@ POWERUP_FLASHING_SEC = 6
 POWERUP_FLASH_RATE = 45
 POWERUP_FRAME_DURATION = 800
 POWERUP_FLASHING_FRAMES = 300
+POWERUP_DROP_CHANCE = 0.2   #chance that an enemy destroyed by a laser drops a powerup
+
+#object pools - the most instances each pool keeps, and how many are constructed when a game starts
+LASER_POOL_CAP = 128
+LASER_POOL_PREWARM = 32
+EXPLOSION_POOL_CAP = 64
+EXPLOSION_POOL_PREWARM = 16
+POWERUP_POOL_CAP = 16
+POWERUP_POOL_PREWARM = 4
 
 #MAIN MENU screen
 TITLE_TXT_WIDTH = 600
@@ -121,127 +196,178 @@ restart_hovered_img = 'images/menus/RESTART_hovered.png'
 main_menu_img = 'images/menus/MAIN-MENU.png'
 main_menu_hovered_img = 'images/menus/MAIN-MENU_hovered.png'
 
+#----------ASSET MANIFEST----------
+#every image drawn by the game as (path, size, alpha), decoded up front so nothing is decoded during gameplay
+ASSET_MANIFEST = ([(space_background, (DISPLAY_WIDTH, DISPLAY_HEIGHT), False),
+                   (main_menu_background, (DISPLAY_WIDTH, DISPLAY_HEIGHT), False)] +
+                  [(image, (HEALTHBAR_WIDTH, HEALTHBAR_HEIGHT), True) for image in healthbar_imgs] +
+                  [(image, (PLAYER_WIDTH, PLAYER_HEIGHT), True) for image in player_sprites] +
+                  [(image, (ENEMY_WIDTH, ENEMY_HEIGHT), True) for image in enemy_sprites] +
+                  [(laser_img, (LASER_WIDTH, LASER_HEIGHT), True)] +
+                  [(image, (EXPLOSION_WIDTH, EXPLOSION_HEIGHT), True) for image in explosion_animation] +
+                  [(image, (POWERUP_WIDTH, POWERUP_HEIGHT), True) for image in powerup_imgs.values()] +
+                  [(title_txt_img, (TITLE_TXT_WIDTH, TITLE_TXT_HEIGHT), True),
+                   (start_txt_img, (START_TXT_WIDTH, START_TXT_HEIGHT), True),
+                   (start_txt_hovered_img, (START_TXT_WIDTH, START_TXT_HEIGHT), True),
+                   (credits_txt_img, (CREDITS_TXT_WIDTH, CREDITS_TXT_HEIGHT), True),
+                   (credits_txt_hovered_img, (CREDITS_TXT_WIDTH, CREDITS_TXT_HEIGHT), True),
+                   (game_over_img, (GAME_OVER_TXT_WIDTH, GAME_OVER_TXT_HEIGHT), True),
+                   (restart_img, (RESTART_TXT_WIDTH, RESTART_TXT_HEIGHT), True),
+                   (restart_hovered_img, (RESTART_TXT_WIDTH, RESTART_TXT_HEIGHT), True),
+                   (main_menu_img, (MAIN_MENU_TXT_WIDTH, MAIN_MENU_TXT_HEIGHT), True),
+                   (main_menu_hovered_img, (MAIN_MENU_TXT_WIDTH, MAIN_MENU_TXT_HEIGHT), True)])
+
 #----------MUSIC & SOUND FX----------
+#mixer - a smaller buffer lowers sound effect latency at the cost of more frequent audio callbacks
+SFX_FREQUENCY = 44100
+SFX_BUFFER_SIZE = 512
+SFX_CHANNELS = 8            #channels reserved for sound effects
+SFX_POLICY = 'steal'        #'steal' cuts off the oldest voice when saturated, 'drop' skips the new sound
+SFX_LASER_VOICES = 3
+SFX_EXPLOSION_VOICES = 4
+
 #main game music
 game_music = "music/Eric Skiff - We're all under the stars.mp3"
 
 #player laser firing
 player_firing_sound = 'soundfx/270343__littlerobotsoundfactory__shoot-01.wav'
 
-#explosion effect
-'''TO IMPLEMENT'''
+#explosion effect - TO IMPLEMENT, the sound engine skips effects without a file
+explosion_sound = None
 
 
 #----------GAME MAINTENANCE----------
 class Main(object):
 
-    '''Main object initialization'''
-    def __init__(self, interface):
+    '''Main object initialization - a headless Main skips window placement and music'''
+    def __init__(self, interface, headless=False):
+
+        self.headless = headless
+        self.launch_time = time.perf_counter()
 
         #initialize OS window placement on screen
-        os.environ['SDL_VIDEO_WINDOW_POS'] = "%d,%d" % (175, 25)
+        if not headless:
+            os.environ['SDL_VIDEO_WINDOW_POS'] = "%d,%d" % (175, 25)
 
-        #game interface setup
+        #game interface setup - every image is decoded before anything is drawn
         self.interface = interface
+        self.load_assets()
         self.interface.set_background(main_menu_background)
+        self.interface.set_healthbar(healthbar_imgs, HEALTHBAR_WIDTH, HEALTHBAR_HEIGHT)
         self.exit = False
 
-        #game music & caption initialization
-        pygame.mixer.music.load(game_music)
-        pygame.mixer.music.play(-1)
-        self.interface.set_caption("Earth Defense")
+        #collision broadphase grids, rebuilt every frame
+        self.collision_mode = COLLISION_MODE
+        self.enemy_grid = SpatialHash(COLLISION_CELL_SIZE)
+        self.powerup_grid = SpatialHash(COLLISION_CELL_SIZE)
 
+        #pools of reusable lasers, explosions and powerups
+        self.laser_pool = ObjectPool(Laser, LASER_POOL_CAP)
+        self.explosion_pool = ObjectPool(Explosion, EXPLOSION_POOL_CAP)
+        self.powerup_pool = ObjectPool(PowerUp, POWERUP_POOL_CAP)
 
-    '''Main Menu screen maintenance'''
-    def main_menu_screen(self):
+        #----------PYGAME GROUPS----------
+        '''
+        EntityGroups holding the object instances, bound to each new game's entity store:
+            - player: player instance
+            - enemy: all enemy instances
+            - laser: all active laser instances (player and enemy)
+            - explosion: all active explosion instances
+            - powerup: all active powerup objects on the field
+        '''
+        self.player_list = EntityGroup(entity_store)
+        self.enemy_list = EntityGroup(entity_store)
+        self.laser_list = EntityGroup(entity_store)
+        self.explosion_list = EntityGroup(entity_store)
+        self.powerup_list = EntityGroup(entity_store)
 
-        #draw MAIN MENU screen
-        self.interface.redraw(self.interface.background, 0, 0)
+        #explosion frames are decoded and scaled once, and shared by every explosion
+        self.explosion_animation = Animation(explosion_animation, (EXPLOSION_WIDTH, EXPLOSION_HEIGHT), EXPLOSION_FRAMES + 1)
 
-        title_txt = pygame.image.load(title_txt_img).convert_alpha()
-        title_txt = pygame.transform.scale(title_txt, (TITLE_TXT_WIDTH, TITLE_TXT_HEIGHT))
-        self.interface.redraw(title_txt, (DISPLAY_WIDTH / 2) - (TITLE_TXT_WIDTH / 2), DISPLAY_HEIGHT / 8)
+        #input source - None reads the keyboard, otherwise a callable taking this Main object and returning an INPUT_* bitmask
+        self.controller = None
 
-        start_txt = pygame.image.load(start_txt_img).convert_alpha()
-        start_txt = pygame.transform.scale(start_txt, (START_TXT_WIDTH, START_TXT_HEIGHT))
-        start_txt_hovered = pygame.image.load(start_txt_hovered_img).convert_alpha()
-        start_txt_hovered = pygame.transform.scale(start_txt_hovered, (START_TXT_WIDTH, START_TXT_HEIGHT))
-        self.interface.redraw(start_txt, (DISPLAY_WIDTH / 2) - (START_TXT_WIDTH / 2), DISPLAY_HEIGHT * (9/12))
+        #optional input recorder (see replay.py), restarted with every new game
+        self.recorder = None
 
-        credits_txt = pygame.image.load(credits_txt_img).convert_alpha()
-        credits_txt = pygame.transform.scale(credits_txt, (CREDITS_TXT_WIDTH, CREDITS_TXT_HEIGHT))
-        credits_txt_hovered = pygame.image.load(credits_txt_hovered_img).convert_alpha()
-        credits_txt_hovered = pygame.transform.scale(credits_txt_hovered, (CREDITS_TXT_WIDTH, CREDITS_TXT_HEIGHT))
-        self.interface.redraw(credits_txt, (DISPLAY_WIDTH / 2) - (CREDITS_TXT_WIDTH / 2), DISPLAY_HEIGHT * (12/14))
+        #optional game mode (see swarm.py), applied to every new game
+        self.game_mode = None
 
-        self.interface.update()
+        #per-phase frame profiler, skipped entirely while disabled
+        self.profiler = FrameProfiler()
+        if PROFILER_ENABLED:
+            self.profiler.toggle()
 
-        #wait for user input
-        input_wait = True
-        mouse_click = False
-        start_button = False
-        credits_button = False
+        #sound effects - disabled when headless or when the mixer is unavailable
+        self.sfx = SoundEngine(SFX_CHANNELS, SFX_POLICY, enabled=not headless)
+        self.sfx.load('laser', player_firing_sound, SFX_LASER_VOICES)
+        self.sfx.load('explosion', explosion_sound, SFX_EXPLOSION_VOICES)
 
-        while input_wait:
+        #game music & caption initialization
+        if self.sfx.enabled:
+            pygame.mixer.music.load(game_music)
+            pygame.mixer.music.play(-1)
+        self.interface.set_caption("Earth Defense")
 
-            #get cursor's location
-            cursor = pygame.mouse.get_pos()
-            cursor_x = cursor[0]
-            cursor_y = cursor[1]
+        #menu screens - images are loaded and scaled once, and reused every time a menu opens
+        self.main_menu = Menu(self.interface,
+            [(asset_manager.load(title_txt_img, (TITLE_TXT_WIDTH, TITLE_TXT_HEIGHT)), (DISPLAY_WIDTH / 2) - (TITLE_TXT_WIDTH / 2), DISPLAY_HEIGHT / 8)],
+            [Button('start', start_txt_img, start_txt_hovered_img, (DISPLAY_WIDTH / 2) - (START_TXT_WIDTH / 2), DISPLAY_HEIGHT * (9/12),
+                START_TXT_WIDTH, START_TXT_HEIGHT),
+             Button('credits', credits_txt_img, credits_txt_hovered_img, (DISPLAY_WIDTH / 2) - (CREDITS_TXT_WIDTH / 2), DISPLAY_HEIGHT * (12/14),
+                CREDITS_TXT_WIDTH, CREDITS_TXT_HEIGHT)])
 
-            start_button = False
-            credits_button = False
+        self.game_over_menu = Menu(self.interface,
+            [(asset_manager.load(game_over_img, (GAME_OVER_TXT_WIDTH, GAME_OVER_TXT_HEIGHT)), (DISPLAY_WIDTH / 2) - (GAME_OVER_TXT_WIDTH / 2), DISPLAY_HEIGHT / 3)],
+            [Button('restart', restart_img, restart_hovered_img, (DISPLAY_WIDTH / 2) - (RESTART_TXT_WIDTH / 2), DISPLAY_HEIGHT * (5/9),
+                RESTART_TXT_WIDTH, RESTART_TXT_HEIGHT),
+             Button('main menu', main_menu_img, main_menu_hovered_img, (DISPLAY_WIDTH / 2) - (MAIN_MENU_TXT_WIDTH / 2), DISPLAY_HEIGHT * (4/6),
+                MAIN_MENU_TXT_WIDTH, MAIN_MENU_TXT_HEIGHT)])
 
-            #Check button hover states
-            #START button
-            if (cursor_x > (DISPLAY_WIDTH / 2) - (START_TXT_WIDTH / 2) and cursor_x < (DISPLAY_WIDTH / 2) + (START_TXT_WIDTH / 2) and
-                    cursor_y > (DISPLAY_HEIGHT * (9/12)) and cursor_y < (DISPLAY_HEIGHT * (9/12)) + (START_TXT_HEIGHT)):
-                    
-                start_button = True
 
-            #CREDITS button
-            elif (cursor_x > (DISPLAY_WIDTH / 2) - (CREDITS_TXT_WIDTH / 2) and cursor_x < (DISPLAY_WIDTH / 2) + (CREDITS_TXT_WIDTH / 2) and
-                    cursor_y > (DISPLAY_HEIGHT * (12/14)) and cursor_y < (DISPLAY_HEIGHT * (12/14)) + (CREDITS_TXT_HEIGHT)):
+    '''Method to load the whole asset manifest from the asset bundle or a thread pool, behind a loading screen unless headless'''
+    def load_assets(self):
 
-                credits_button = True
+        start = time.perf_counter()
+        if asset_manager.bundle is None and asset_manager.open_bundle(ASSET_BUNDLE_PATH):
+            logger.info('using asset bundle %s', ASSET_BUNDLE_PATH)
 
-            #Update hover text upon mouse hover
-            #START button
-            if start_button:
-                self.interface.redraw(start_txt_hovered, (DISPLAY_WIDTH / 2) - (START_TXT_WIDTH / 2), DISPLAY_HEIGHT * (9/12))
+        count = asset_manager.preload(ASSET_MANIFEST, ASSET_PRELOAD_WORKERS, None if self.headless else self.loading_screen)
+        logger.info('preloaded %d assets in %.1f ms', count, (time.perf_counter() - start) * 1000)
 
-            else:
-                self.interface.redraw(start_txt, (DISPLAY_WIDTH / 2) - (START_TXT_WIDTH / 2), DISPLAY_HEIGHT * (9/12))
 
-            #CREDITS button
-            if credits_button:
-                self.interface.redraw(credits_txt_hovered, (DISPLAY_WIDTH / 2) - (CREDITS_TXT_WIDTH / 2), DISPLAY_HEIGHT * (12/14))
+    '''Loading screen maintenance - draws the progress bar after each decoded asset'''
+    def loading_screen(self, done, total):
 
-            else:
-                self.interface.redraw(credits_txt, (DISPLAY_WIDTH / 2) - (CREDITS_TXT_WIDTH / 2), DISPLAY_HEIGHT * (12/14))
+        display = self.interface.display
+        bar = pygame.Rect(0, 0, LOADING_BAR_WIDTH, LOADING_BAR_HEIGHT)
+        bar.center = (DISPLAY_WIDTH / 2, DISPLAY_HEIGHT / 2)
+        bar = self.interface.scale_rect(bar)
 
-            self.interface.update()
+        display.fill(BLACK)
+        pygame.draw.rect(display, LOADING_BAR_COLOR, bar, 2)
+        pygame.draw.rect(display, LOADING_BAR_COLOR, (bar.x, bar.y, bar.width * done // total, bar.height))
+        pygame.display.update()
 
-            #check for mouse click
-            for event in pygame.event.get():
+        #keep the window responsive while loading
+        pygame.event.pump()
 
-                if event.type == QUIT or self.exit == True:
-                    return
 
-                if event.type == MOUSEBUTTONDOWN:
-                    mouse_click = True
+    '''Main Menu screen maintenance'''
+    def main_menu_screen(self):
 
-                #check for user option selection
-                if mouse_click and event.type == MOUSEBUTTONUP and start_button:
-                    input_wait = False
+        #the first main menu frame is the game's first frame
+        self.main_menu.draw()
+        if self.launch_time is not None:
+            logger.info('time to first frame: %.1f ms', (time.perf_counter() - self.launch_time) * 1000)
+            self.launch_time = None
 
-                elif mouse_click and event.type == MOUSEBUTTONUP and credits_button:
-                    input_wait = False
+        selection = self.main_menu.run(redraw=False)
 
-        if start_button:
+        if selection == 'start':
             self.main()
 
-        elif credits_button:
+        elif selection == 'credits':
             self.credits_screen()
 
 
@@ -251,300 +377,352 @@ class Main(object):
         return
 
 
-    '''Game Over screen maintenance'''
+    '''Game Over screen maintenance - returns 'restart', 'main menu' or None if the window was closed'''
     def game_over_screen(self):
 
-        #draw the GAME OVER screen
-        self.interface.redraw(self.interface.background, 0, 0)
-
-        game_over_txt = pygame.image.load(game_over_img).convert_alpha()
-        game_over_txt = pygame.transform.scale(game_over_txt, (GAME_OVER_TXT_WIDTH, GAME_OVER_TXT_HEIGHT))
-        self.interface.redraw(game_over_txt, (DISPLAY_WIDTH / 2) - (GAME_OVER_TXT_WIDTH / 2), DISPLAY_HEIGHT / 3)
-
-        restart_txt = pygame.image.load(restart_img).convert_alpha()
-        restart_txt = pygame.transform.scale(restart_txt, (RESTART_TXT_WIDTH, RESTART_TXT_HEIGHT))
-        restart_txt_hovered = pygame.image.load(restart_hovered_img).convert_alpha()
-        restart_txt_hovered = pygame.transform.scale(restart_txt_hovered, (RESTART_TXT_WIDTH, RESTART_TXT_HEIGHT))
-        self.interface.redraw(restart_txt, (DISPLAY_WIDTH / 2) - (RESTART_TXT_WIDTH / 2), DISPLAY_HEIGHT * (5/9))
-
-        main_menu_txt = pygame.image.load(main_menu_img).convert_alpha()
-        main_menu_txt = pygame.transform.scale(main_menu_txt, (MAIN_MENU_TXT_WIDTH, MAIN_MENU_TXT_HEIGHT))
-        main_menu_txt_hovered = pygame.image.load(main_menu_hovered_img).convert_alpha()
-        main_menu_txt_hovered = pygame.transform.scale(main_menu_txt_hovered, (MAIN_MENU_TXT_WIDTH, MAIN_MENU_TXT_HEIGHT))
-        self.interface.redraw(main_menu_txt, (DISPLAY_WIDTH / 2) - (MAIN_MENU_TXT_WIDTH / 2), DISPLAY_HEIGHT * (4/6))
-
-        self.interface.update()
-
-
-        #wait for user input
-        input_wait = True
-        mouse_click = False
-        restart_button = False
-        main_menu_button = False
-
-        while input_wait:
-
-            #get cursor's location
-            cursor = pygame.mouse.get_pos()
-            cursor_x = cursor[0]
-            cursor_y = cursor[1]
-
-            restart_button = False
-            main_menu_button = False
-
-            #check RESTART button
-            if (cursor_x > (DISPLAY_WIDTH / 2) - (RESTART_TXT_WIDTH / 2) and cursor_x < (DISPLAY_WIDTH / 2) + (RESTART_TXT_WIDTH / 2) and
-                    cursor_y > (DISPLAY_HEIGHT * (5/9)) and cursor_y < (DISPLAY_HEIGHT * (5/9)) + (RESTART_TXT_HEIGHT)):
-                    
-                restart_button = True
-
-            #check MAIN MENU button
-            elif (cursor_x > (DISPLAY_WIDTH / 2) - (MAIN_MENU_TXT_WIDTH / 2) and cursor_x < (DISPLAY_WIDTH / 2) + (MAIN_MENU_TXT_WIDTH / 2) and
-                    cursor_y > (DISPLAY_HEIGHT * (4/6)) and cursor_y < (DISPLAY_HEIGHT * (4/6)) + (MAIN_MENU_TXT_HEIGHT)):
-
-                main_menu_button = True
+        selection = self.game_over_menu.run()
+        if selection is None:
+            self.exit_game()
 
+        return selection
 
-            #update text upon mouse hover
-            #RESTART button
-            if restart_button:
-                self.interface.redraw(restart_txt_hovered, (DISPLAY_WIDTH / 2) - (RESTART_TXT_WIDTH / 2), DISPLAY_HEIGHT * (5/9))
 
-            else:
-                self.interface.redraw(restart_txt, (DISPLAY_WIDTH / 2) - (RESTART_TXT_WIDTH / 2), DISPLAY_HEIGHT * (5/9))
+    '''Method to set up a new game - empties the entity groups, creates the player ship and the Game object seeded with seed.'''
+    def new_game(self, seed=None):
 
-            #MAIN MENU button
-            if main_menu_button:
-                self.interface.redraw(main_menu_txt_hovered, (DISPLAY_WIDTH / 2) - (MAIN_MENU_TXT_WIDTH / 2), DISPLAY_HEIGHT * (4/6))
+        #return the previous game's lasers, explosions and powerups to their pools, and drop its player and enemies
+        for laser in self.laser_list:
+            self.laser_pool.release(laser)
+        for explosion in self.explosion_list:
+            self.explosion_pool.release(explosion)
+        for powerup in self.powerup_list:
+            self.powerup_pool.release(powerup)
+        self.player_list.empty()
+        self.enemy_list.empty()
 
-            else:
-                self.interface.redraw(main_menu_txt, (DISPLAY_WIDTH / 2) - (MAIN_MENU_TXT_WIDTH / 2), DISPLAY_HEIGHT * (4/6))
+        #construct pooled instances up front so the first seconds of gameplay do not allocate
+        self.laser_pool.prewarm(LASER_POOL_PREWARM, 0, 0, LASER_WIDTH, LASER_HEIGHT, LASER_VEL, laser_img)
+        self.explosion_pool.prewarm(EXPLOSION_POOL_PREWARM, 0, 0, self.explosion_animation, 0)
+        self.powerup_pool.prewarm(POWERUP_POOL_PREWARM, 0, 0, POWERUP_WIDTH, POWERUP_HEIGHT, 'bubble_shield',
+            powerup_imgs['bubble_shield'], POWERUP_FRAME_DURATION)
 
-            pygame.display.update()
+        #initialize Game object to hold game attributes - a game mode may change them before the player is created
+        self.game = GameHandler(seed, LASER_RANGE, PLAYER_HEALTH, POWERUP_DROP_CHANCE)
+        if self.game_mode is not None:
+            self.game_mode.setup(self)
 
+        #the emptied groups now back their entities with the new game's entity store
+        for group in (self.player_list, self.enemy_list, self.laser_list, self.explosion_list, self.powerup_list):
+            group.store = self.game.entities
 
-            #check for mouse click
-            for event in pygame.event.get():
-
-                if event.type == QUIT:
-                    self.exit_game()
-                    return
-
-                if event.type == MOUSEBUTTONDOWN:
-                    mouse_click = True
+        #Attribute initialization
+        #player
+        self.player_ship = PlayerShip(self.player_list, 425, 400, PLAYER_WIDTH, PLAYER_HEIGHT, self.game.player_health)
+        self.player_ship.set_sprite(player_sprites[0])
 
-                #check for user option selection
-                if mouse_click and event.type == MOUSEBUTTONUP and restart_button:
-                    input_wait = False
-                    return 'restart'
+        #----------TIMERS----------
+        #enemies spawn every spawn interval unless a game mode spawner replaced it, and the guns start cooling down
+        if self.game.spawner is None:
+            self.game.spawn_timer = self.game.scheduler.schedule(self.to_ticks(self.game.spawn_interval), self.spawn_on_timer)
+        self.start_reload()
 
-                elif mouse_click and event.type == MOUSEBUTTONUP and main_menu_button:
-                    input_wait = False
-                    return 'main menu'
-
-        return
+        if self.recorder is not None:
+            self.recorder.start(self.game.seed)
 
 
     '''Main running game loop'''
-    def main(self):
+    def main(self, seed=None):
 
-        #----------PYGAME GROUPS----------
-        '''
-        Lists to hold object instances using pygame's Sprite superclass:
-            - player: player instance
-            - enemy: all enemy instances
-            - laser: all active laser instances (player and enemy)
-            - explosion: all active explosion instances
-            - powerup: all active powerup objects on the field
-        '''
-        player_list = pygame.sprite.Group()
-        enemy_list = pygame.sprite.Group()
-        laser_list = pygame.sprite.Group()
-        explosion_list = pygame.sprite.Group()
-        powerup_list = pygame.sprite.Group()
-    
-        #Attribute initialization
-        #player
-        player_ship = PlayerShip(player_list, 425, 400, PLAYER_WIDTH, PLAYER_HEIGHT, PLAYER_HEALTH)
-        player_ship.set_sprite(player_sprites[0])
+        self.new_game(seed)
 
         #game interface
         self.interface.set_background(space_background)
         self.interface.redraw(self.interface.background, 0, 0)
-        self.interface.update_healthbar(healthbar_imgs[3])
+        self.interface.update_healthbar(self.game.player_health, self.game.player_health)
 
-        #initialize Game object to hold game attributes
-        game = GameHandler()
+        #fixed-timestep accumulator - holds the real time (ms) not yet consumed by simulation ticks
+        accumulator = 0
+        self.game.clock.tick()
 
         #------------------------CONTINUOUS GAME LOOP------------------------
-        while(game.running):
+        while(self.game.running):
 
-            #run game at: 1000/90 = ~11 milliseconds per frame (90 FPS)
-            pygame.time.delay(11)
+            #measure the real time since the last frame - capped so a stall does not trigger a burst of catch-up ticks
+            accumulator += min(self.game.clock.tick(MAX_FPS), MAX_FRAME_TIME)
 
             #check stdin & game variables
             for event in pygame.event.get():
 
                 if event.type == QUIT or self.exit == True:
-                    game.running = False
+                    self.game.running = False
+                    self.finish_recording()
+                    if self.profiler.enabled:
+                        self.profiler.dump_trace(PROFILER_TRACE_PATH)
                     self.exit_game()
                     return
 
+                #toggle between dirty-rectangle and full-screen rendering to compare them
+                if event.type == KEYDOWN and event.key == K_F2:
+                    self.interface.set_dirty_rendering(not self.interface.dirty_rendering)
+
+                #toggle the frame profiler overlay, and write out its trace
+                if event.type == KEYDOWN and event.key == K_F3:
+                    self.profiler.toggle()
+
+                if event.type == KEYDOWN and event.key == K_F4:
+                    self.profiler.dump_trace(PROFILER_TRACE_PATH)
+
             #check for game over
-            if game.game_over and game.final_explosion:
-                enemy_list.clear(self.interface.display, self.interface.background)
-                laser_list.clear(self.interface.display, self.interface.background)
-                explosion_list.clear(self.interface.display, self.interface.background)
-                player_list.clear(self.interface.display, self.interface.background)
-                powerup_list.clear(self.interface.display, self.interface.background)
+            if self.game.game_over and self.game.final_explosion:
+                self.finish_recording()
+
+                #scripted sessions (e.g. replays) end with the game instead of waiting on the GAME OVER screen
+                if self.controller is not None:
+                    return
+
                 selection = self.game_over_screen()
 
                 #Restart game case
                 if selection == 'restart':
-                    game.game_over = False
-                    game.final_explosion = True
+
+                    #REINIT game attributes and Game object
+                    self.new_game()
 
                     #REINIT game interface
                     self.interface.set_background(space_background)
-                    self.interface.update_healthbar(healthbar_imgs[3])
-
-                    #REINIT game attributes - redraw background over sprite.Groups
-                    player_ship = PlayerShip(player_list, 425, 400, PLAYER_WIDTH, PLAYER_HEIGHT, PLAYER_HEALTH)
-                    player_ship.set_sprite(player_sprites[0])
+                    self.interface.update_healthbar(self.game.player_health, self.game.player_health)
                     self.interface.redraw(self.interface.background, 0, 0)
                     self.interface.update()
 
-                    #REINIT Game object and re-enter game loop
-                    game = GameHandler()
-
+                    #restart the accumulator so time spent on the GAME OVER screen is not simulated, then re-enter game loop
+                    accumulator = 0
+                    self.game.clock.tick()
                     continue
 
                 #Return to Main Menu case
                 if selection == 'main menu':
                     return
 
-                
-            #----------PLAYER MAINTENANCE----------
-            #get keyboard inputs
-            pressed_keys = pygame.key.get_pressed()
+            #run as many fixed simulation ticks as the elapsed real time covers
+            accumulator -= self.run_ticks(int(accumulator // TICK_TIME)) * TICK_TIME
+
+            #render between the last two ticks, interpolating by the leftover fraction of a tick
+            self.render_frame(accumulator / TICK_TIME)
 
-            #player ship movement
-            if not player_ship.stunned:
+        self.finish_recording()
+        return
 
-                if pressed_keys[K_a] or pressed_keys[K_LEFT]:
-                    if player_ship.x <= 0 - player_ship.width / 2:
-                        player_ship.x = (self.interface.display_width - player_ship.width / 2)
 
-                    else:
-                        player_ship.x -= 1 * player_ship.vel
+    '''Method to run up to count simulation ticks on the controller or keyboard inputs, without rendering or waiting - stops early when the game ends and returns the number of ticks run'''
+    def run_ticks(self, count):
 
-                if pressed_keys[K_d] or pressed_keys[K_RIGHT]:
-                    if player_ship.x >= (self.interface.display_width - player_ship.width / 2):
-                        player_ship.x = 0 - player_ship.width / 2
+        for tick in range(count):
 
-                    else:
-                        player_ship.x += 1 * player_ship.vel
+            #get inputs - a controller may stop the game when it runs out of input
+            controls = self.get_controls()
+            if not self.game.running:
+                return tick
 
-                if pressed_keys[K_w] or pressed_keys[K_UP]:
-                    if player_ship.y <= 0 + player_ship.height / 2:
-                        pass
-                    else:
-                        player_ship.y -= 1 * player_ship.vel
+            self.update_tick(controls)
 
-                if pressed_keys[K_s] or pressed_keys[K_DOWN]:
-                    if player_ship.y >= self.interface.display_height - (4 * player_ship.height) / 2:
-                        pass
-                    else:
-                        player_ship.y += 1 * player_ship.vel
+            if self.game.game_over and self.game.final_explosion:
+                return tick + 1
 
-            player_ship.update_hitbox()
+        return count
 
-            
-            #player ship firing sprite maintenance
-            if player_ship.firing:
 
-                player_ship.fire_frame_count += 1
-                if player_ship.get_fire_frame_count() >= FIRING_FRAMES:
-                    player_ship.set_sprite(player_sprites[0])
-                    player_ship.firing = False
-                    
+    '''Method to get the INPUT_* bitmask for the next tick, from the controller or the keyboard'''
+    def get_controls(self):
 
-            #player ship powerup maintenance
-            powerup_effect_time = pygame.time.get_ticks()
-            if powerup_effect_time - player_ship.get_powerup_start_time() >= PLAYER_POWERUP_DURATION:
-                player_ship.remove_powerup()
+        if self.controller is not None:
+            return self.controller(self)
+        return self.get_input(pygame.key.get_pressed())
 
 
-            #laser firing
-            if not player_ship.stunned:
+    '''Method to write out the current recording, if one is active'''
+    def finish_recording(self):
 
-                curr_fire = pygame.time.get_ticks()
-                if (pressed_keys[K_RETURN] or pressed_keys[K_SPACE]) and curr_fire - player_ship.prev_fire >= player_ship.firing_interval:
+        if self.recorder is not None:
+            self.recorder.finish(self)
 
-                    #x-values to fire from player ship's left and right guns (visual adjustments made here)
-                    player_ship.prev_fire = curr_fire
-                    Laser(laser_list, player_ship.x + 4.8, player_ship.y + 15, LASER_WIDTH, LASER_HEIGHT, LASER_VEL, laser_img)
-                    Laser(laser_list, player_ship.x + (player_ship.width - 6), player_ship.y + 15, LASER_WIDTH, LASER_HEIGHT, LASER_VEL, laser_img)
 
-                    #change player ship to firing effect sprite
-                    player_ship.set_sprite(player_sprites[1])
-                    player_ship.fire_frame_count = 0
-                    player_ship.firing = True
+    '''Method to convert the keyboard state into an INPUT_* bitmask'''
+    def get_input(self, pressed_keys):
 
+        controls = 0
+        if pressed_keys[K_a] or pressed_keys[K_LEFT]:
+            controls |= INPUT_LEFT
+        if pressed_keys[K_d] or pressed_keys[K_RIGHT]:
+            controls |= INPUT_RIGHT
+        if pressed_keys[K_w] or pressed_keys[K_UP]:
+            controls |= INPUT_UP
+        if pressed_keys[K_s] or pressed_keys[K_DOWN]:
+            controls |= INPUT_DOWN
+        if pressed_keys[K_RETURN] or pressed_keys[K_SPACE]:
+            controls |= INPUT_FIRE
 
-            #----------LASER MAINTENANCE----------
-            for laser in laser_list:
+        return controls
 
-                hit = False
-                
-                #check if laser exceeds maximum travel distance
-                if laser.get_travel() >= LASER_RANGE:
-                    laser_list.remove(laser)
-                    continue
 
-                for enemy in enemy_list:
+    '''Method to advance the game simulation by a single fixed tick, given the INPUT_* bitmask held during it'''
+    def update_tick(self, controls):
 
-                    #laser collision - eliminates enemy and creates explosion (visually adjusted)
-                    if self.is_collision(laser, enemy):
-                        hit = True
-                        Explosion(explosion_list, enemy.x - 2.2, enemy.y, EXPLOSION_WIDTH, EXPLOSION_HEIGHT,
-                            explosion_animation, EXPLOSION_FRAMES)
-                        enemy_list.remove(enemy)
-                        laser_list.remove(laser)
+        #remember positions before moving so frames can be interpolated between ticks
+        self.game.entities.save_positions()
+
+        if self.recorder is not None:
+            self.recorder.record(controls)
+
+        if self.profiler.enabled:
+            timed = self.profiler.timed
+            timed('timers', self.game.scheduler.run_due, self.game.ticks)
+            timed('player_input', self.update_player, controls)
+            timed('lasers', self.update_lasers)
+            timed('enemies', self.update_enemies)
+            timed('explosions', self.update_explosions)
+            timed('powerups', self.update_powerups)
+            timed('counters', self.update_counters)
+
+        else:
+            #fire the timers due this tick - enemy spawns, the fire cooldown and powerup expiry
+            self.game.scheduler.run_due(self.game.ticks)
+            self.update_player(controls)
+            self.update_lasers()
+            self.update_enemies()
+            self.update_explosions()
+            self.update_powerups()
+            self.update_counters()
+
+        self.game.ticks += 1
+        self.game.sim_time = self.game.ticks * TICK_TIME
+
+
+    '''Player maintenance - movement, firing sprite, powerups and laser firing'''
+    def update_player(self, controls):
 
-                        #on successful hit, small chance a random powerup drops
-                        if random.randint(1, 10) % 5 == 0:
-                            powerup_modifier = random.choice(['bubble_shield', 'fire_rate', 'health_up', 'zap_field'])
-                            PowerUp(powerup_list, enemy.x + (enemy.width/2 - POWERUP_WIDTH/2), enemy.y + (enemy.height/2 - POWERUP_HEIGHT/2),
-                                POWERUP_WIDTH, POWERUP_HEIGHT, powerup_modifier, powerup_imgs[powerup_modifier], POWERUP_FRAME_DURATION)
+        player_ship = self.player_ship
+        laser_list = self.laser_list
+        game = self.game
 
-                        break
+        #player ship movement
+        if not player_ship.stunned:
 
-                if hit == False:
-                    laser.y -= 1 * laser.vel
+            if controls & INPUT_LEFT:
+                if player_ship.x <= 0 - player_ship.width / 2:
+                    player_ship.x = (self.interface.display_width - player_ship.width / 2)
+                    player_ship.save_position()
 
-                
-            #----------ENEMY MAINTENANCE----------
-            #spawn in enemies based on elapsed time
-            interval_end = pygame.time.get_ticks()
-            if interval_end - game.interval_start >= game.spawn_interval and len(enemy_list) < game.max_enemies:
+                else:
+                    player_ship.x -= 1 * player_ship.vel
+
+            if controls & INPUT_RIGHT:
+                if player_ship.x >= (self.interface.display_width - player_ship.width / 2):
+                    player_ship.x = 0 - player_ship.width / 2
+                    player_ship.save_position()
+
+                else:
+                    player_ship.x += 1 * player_ship.vel
+
+            if controls & INPUT_UP:
+                if player_ship.y <= 0 + player_ship.height / 2:
+                    pass
+                else:
+                    player_ship.y -= 1 * player_ship.vel
+
+            if controls & INPUT_DOWN:
+                if player_ship.y >= self.interface.display_height - (4 * player_ship.height) / 2:
+                    pass
+                else:
+                    player_ship.y += 1 * player_ship.vel
+
+
+        #player ship firing sprite maintenance
+        if player_ship.firing:
+
+            player_ship.fire_frame_count += 1
+            if player_ship.get_fire_frame_count() >= FIRING_FRAMES:
+                player_ship.set_sprite(player_sprites[0])
+                player_ship.firing = False
+
+
+        #laser firing
+        if not player_ship.stunned:
+
+            if controls & INPUT_FIRE and not player_ship.reloading:
+
+                #x-values to fire from player ship's left and right guns (visual adjustments made here)
+                self.start_reload()
+                game.shots_fired += 2
+                self.laser_pool.acquire(laser_list, player_ship.x + 4.8, player_ship.y + 15, LASER_WIDTH, LASER_HEIGHT, LASER_VEL, laser_img)
+                self.laser_pool.acquire(laser_list, player_ship.x + (player_ship.width - 6), player_ship.y + 15, LASER_WIDTH, LASER_HEIGHT, LASER_VEL, laser_img)
+                self.sfx.play('laser')
+
+                #change player ship to firing effect sprite
+                player_ship.set_sprite(player_sprites[1])
+                player_ship.fire_frame_count = 0
+                player_ship.firing = True
+
+
+    '''Laser maintenance - travel distance, enemy hits and powerup drops'''
+    def update_lasers(self):
+
+        laser_list = self.laser_list
+        enemy_list = self.enemy_list
+        powerup_list = self.powerup_list
+
+        #check if lasers exceed maximum travel distance
+        for laser in laser_list:
+            if laser.get_travel() >= self.game.laser_range:
+                self.laser_pool.release(laser)
 
-                #reset spawn interval
-                game.interval_start = interval_end
+        #find the enemy hit by each remaining laser over the move it is about to make
+        laser_hits = self.find_laser_hits(laser_list, enemy_list)
 
-                #spawn enemy randomly on the field
-                new_enemy = EnemyShip(enemy_list, random.randint(50, DISPLAY_WIDTH - 50), -50, ENEMY_WIDTH, ENEMY_HEIGHT)
-                new_enemy.set_sprite(enemy_sprites[random.randint(0, len(enemy_sprites) - 1)])
+        for laser in laser_list:
 
-            #update enemy positions - enemies move closer to Earth at the set velocity
-            for enemy in enemy_list:
+            enemy = laser_hits.get(laser)
 
-                #1 - check for enemy reaches Earth case
-                if enemy.y >= DISPLAY_HEIGHT - EXPLOSION_HEIGHT / 2:
-                    Explosion(explosion_list, enemy.x - 2.2, enemy.y, EXPLOSION_WIDTH, EXPLOSION_HEIGHT,
-                        explosion_animation, EXPLOSION_FRAMES)
-                    enemy_list.remove(enemy)
-                    
+            #laser collision - eliminates enemy and creates explosion (visually adjusted)
+            if enemy is not None:
+                self.game.kills += 1
+                self.spawn_explosion(enemy)
+                self.laser_pool.release(laser)
+
+                #on successful hit, small chance a random powerup drops
+                if self.game.rng.random() < self.game.powerup_drop_chance:
+                    powerup_modifier = self.game.rng.choice(['bubble_shield', 'fire_rate', 'health_up', 'zap_field'])
+                    self.powerup_pool.acquire(powerup_list, enemy.x + (enemy.width/2 - POWERUP_WIDTH/2), enemy.y + (enemy.height/2 - POWERUP_HEIGHT/2),
+                        POWERUP_WIDTH, POWERUP_HEIGHT, powerup_modifier, powerup_imgs[powerup_modifier], POWERUP_FRAME_DURATION)
+
+                #removing the enemy frees its entity store slot, so it goes last
+                enemy_list.remove(enemy)
+
+        #move every remaining laser at once
+        self.game.entities.integrate(TYPE_LASER)
+
+
+    '''Enemy maintenance - spawning, Earth damage, player collisions and movement'''
+    def update_enemies(self):
+
+        player_ship = self.player_ship
+        enemy_list = self.enemy_list
+        game = self.game
+
+        #a game mode spawner (e.g. swarm mode) decides how many enemies spawn each tick
+        if game.spawner is not None:
+            for i in range(game.spawner(game, len(enemy_list))):
+                self.spawn_enemy()
+
+        #only the enemies that reached Earth or touch the player need handling - every other enemy just moves
+        for enemy in self.find_enemy_events():
+
+            #1 - check for enemy reaches Earth case
+            if enemy.y >= DISPLAY_HEIGHT - EXPLOSION_HEIGHT / 2:
+                self.spawn_explosion(enemy)
+                enemy_list.remove(enemy)
+                game.earth_damage += 1
+
+                if not game.invulnerable:
                     player_ship.health -= 1
 
                     #check for Game Over case
@@ -553,107 +731,213 @@ class Main(object):
                         game.game_over = True
 
 
-                #2 - check for player ship collision case
-                elif self.is_collision(player_ship, enemy):
+            #2 - check for player ship collision case
+            elif self.is_collision(player_ship, enemy):
 
-                    #player becomes stunned and enemy ship explodes
-                    player_ship.stun_player(STUN_FRAME_DURATION)
-                    Explosion(explosion_list, enemy.x - 2.2, enemy.y, EXPLOSION_WIDTH, EXPLOSION_HEIGHT,
-                            explosion_animation, EXPLOSION_FRAMES)
-                    enemy_list.remove(enemy)
+                #player becomes stunned and enemy ship explodes
+                player_ship.stun_player(STUN_FRAME_DURATION)
+                game.player_hits += 1
+                self.spawn_explosion(enemy)
+                enemy_list.remove(enemy)
 
-                else:
-                    enemy.y += 1 * enemy.vel
-                    enemy.update_hitbox()
+        #move every remaining enemy closer to Earth at once
+        game.entities.integrate(TYPE_ENEMY)
 
 
-            #----------EXPLOSION MAINTENANCE----------
-            #update all explosions
-            for explosion in explosion_list:
+    '''Timer callback spawning an enemy every spawn interval - while the field is full it retries on every tick'''
+    def spawn_on_timer(self):
 
-                if explosion.get_frame_count() >= EXPLOSION_FRAMES:
+        game = self.game
+        if len(self.enemy_list) < game.max_enemies:
+            self.spawn_enemy()
+            game.scheduler.reschedule(game.spawn_timer, self.to_ticks(game.spawn_interval))
+        else:
+            game.scheduler.reschedule(game.spawn_timer, 1)
 
-                    #eliminate explosion if it has completed the last frame of the animation
-                    if explosion.index == len(explosion_animation) - 1:
-                        explosion_list.remove(explosion)
 
-                        #if it was the game's final explosion, game is now over
-                        if game.final_explosion == False:
-                            game.final_explosion = True
+    '''Method to start the player's fire cooldown, lasting the current firing interval'''
+    def start_reload(self):
 
-                        continue
+        game = self.game
+        self.player_ship.reloading = True
+        game.reload_timer = game.scheduler.schedule(self.to_ticks(self.player_ship.firing_interval), self.finish_reload)
 
-                    else:
-                        explosion.next_sprite()
-                        continue
 
-                explosion.frame_count += 1
+    '''Timer callback ending the player's fire cooldown'''
+    def finish_reload(self):
 
+        self.player_ship.reloading = False
 
-            #----------POWERUP MAINTENANCE-----------
-            for powerup in powerup_list:
 
-                #start flashing powerup prior to disappearing
-                if powerup.get_frame_count() <= POWERUP_FLASHING_FRAMES and not powerup.flashing:
-                    powerup.flash_powerup()
+    '''Method to start or restart the expiry timer of the player's shield and fire-rate powerups'''
+    def start_powerup_timer(self):
 
-                #remove when powerup expires
-                elif powerup.get_frame_count() <= 0 and powerup.flashing:
-                    powerup_list.remove(powerup)
+        game = self.game
+        delay = self.to_ticks(PLAYER_POWERUP_DURATION * 1000)
+        if game.powerup_timer is None:
+            game.powerup_timer = game.scheduler.schedule(delay, self.player_ship.remove_powerup)
+        else:
+            game.scheduler.reschedule(game.powerup_timer, delay)
 
-                #check for player collecting powerup
-                if self.is_collision(player_ship, powerup):
 
-                    #player gains powerup effect - perform zap-field (targets enemies, not player) only if True is returned
-                    if player_ship.apply_powerup(powerup.modifier):
-                        for enemy in enemy_list:
-                            Explosion(explosion_list, enemy.x - 2.2, enemy.y, EXPLOSION_WIDTH, EXPLOSION_HEIGHT,
-                                explosion_animation, EXPLOSION_FRAMES)
-                            enemy_list.remove(enemy)
+    '''Method to convert a duration in milliseconds to the number of ticks needed to simulate at least that long'''
+    def to_ticks(self, ms):
 
-                    powerup_list.remove(powerup)
+        return max(1, math.ceil(ms * TICK_RATE / 1000))
 
 
-            #----------FRAME UPDATING----------         
+    '''Method to spawn an enemy at a random position above the field'''
+    def spawn_enemy(self):
 
-            #update the frame with all modified object attributes - last objects are drawn on top
-            self.interface.redraw(self.interface.background, 0, 0)
+        game = self.game
+        new_enemy = EnemyShip(self.enemy_list, game.rng.randint(50, DISPLAY_WIDTH - 50), -50, ENEMY_WIDTH, ENEMY_HEIGHT)
+        new_enemy.set_sprite(enemy_sprites[game.rng.randint(0, len(enemy_sprites) - 1)])
+        new_enemy.vel = game.enemy_vel
+        game.enemies_spawned += 1
 
-            #if the final explosion was triggered, the explosion animation completes and rest of screen freezes
-            if game.final_explosion:
 
-                if player_ship.stunned:
-                    if player_ship.get_stun_frame_count() % STUN_BLIT_RATE in (0, 1, 2, 3):
-                        player_ship.redraw(self.interface)
-                    player_ship.stun_frame_count -= 1
-                    
-                else:
-                    player_ship.redraw(self.interface)
+    '''Method to find the enemies that reached Earth or touch the player ship, in group order'''
+    def find_enemy_events(self):
+
+        #one pass over the entity store arrays instead of a test per enemy - without NumPy every enemy is a candidate
+        store = self.game.entities
+        slots = find_store_collisions(store, TYPE_ENEMY, self.player_ship.hitbox, DISPLAY_HEIGHT - EXPLOSION_HEIGHT / 2)
+        if slots is None:
+            return list(self.enemy_list)
+
+        if not len(slots):
+            return []
+        candidates = {store.owners[slot] for slot in slots}
+        return [enemy for enemy in self.enemy_list if enemy in candidates]
+
+
+    '''Explosion maintenance - removes every explosion whose animation has completed'''
+    def update_explosions(self):
+
+        explosion_list = self.explosion_list
+        game = self.game
+
+        #eliminate explosions that have completed the last frame of the animation - the current tick counts towards their age
+        for explosion in explosion_list:
+            if explosion.animation.is_finished(game.ticks + 1 - explosion.start_tick):
+                self.explosion_pool.release(explosion)
 
-                for laser in laser_list:
-                    laser.redraw(self.interface)
+                #if it was the game's final explosion, game is now over
+                if game.final_explosion == False:
+                    game.final_explosion = True
+
+
+    '''Powerup maintenance - flashing, expiry and collection'''
+    def update_powerups(self):
+
+        player_ship = self.player_ship
+        enemy_list = self.enemy_list
+        powerup_list = self.powerup_list
+
+        #find the powerups the player is touching through the grid rather than testing each one
+        self.powerup_grid.build(powerup_list)
+        collected_powerups = self.powerup_grid.all_collisions(player_ship)
+
+        for powerup in powerup_list:
+
+            #start flashing powerup prior to disappearing
+            if powerup.get_frame_count() <= POWERUP_FLASHING_FRAMES and not powerup.flashing:
+                powerup.flash_powerup()
+
+            #remove when powerup expires
+            elif powerup.get_frame_count() <= 0 and powerup.flashing:
+                self.powerup_pool.release(powerup)
+
+            #check for player collecting powerup
+            if powerup in collected_powerups:
+                self.game.powerups_collected += 1
+
+                #player gains powerup effect - perform zap-field (targets enemies, not player) only if True is returned
+                if player_ship.apply_powerup(powerup.modifier):
+                    for enemy in enemy_list:
+                        self.spawn_explosion(enemy)
+                        enemy_list.remove(enemy)
+                        self.game.kills += 1
+
+                #a new shield or fire-rate powerup restarts the expiry of the active one
+                if powerup.modifier in ('bubble_shield', 'fire_rate'):
+                    self.start_powerup_timer()
+
+                self.powerup_pool.release(powerup)
+
+
+    '''Method to start an explosion centred on a destroyed enemy at the current tick'''
+    def spawn_explosion(self, enemy):
+        self.explosion_pool.acquire(self.explosion_list, enemy.x + (enemy.width - EXPLOSION_WIDTH) / 2,
+            enemy.y + (enemy.height - EXPLOSION_HEIGHT) / 2, self.explosion_animation, self.game.ticks)
+        self.sfx.play('explosion')
 
-                for powerup in powerup_list:
-                    if powerup.flashing:
-                        if powerup.get_frame_count() % POWERUP_FLASH_RATE <= (POWERUP_FLASH_RATE/2):
-                            powerup.redraw(self.interface)
 
-                    else:
-                        powerup.redraw(self.interface)
-                    powerup.frame_count -= 1
+    '''Stun and powerup lifetime counters - frozen while the final explosion plays'''
+    def update_counters(self):
 
-                for enemy in enemy_list:
-                    enemy.redraw(self.interface)
+        if not self.game.final_explosion:
+            return
 
-            for explosion in explosion_list:
-                explosion.redraw(self.interface)
+        #get_stun_frame_count lifts the stun once the count runs out
+        if self.player_ship.stunned:
+            self.player_ship.get_stun_frame_count()
+            self.player_ship.stun_frame_count -= 1
 
-            #update Earth healthbar
-            self.interface.update_healthbar(healthbar_imgs[player_ship.health])
+        self.game.entities.tick_timers(TYPE_POWERUP, -1)
+
+
+    '''Method to draw and display the current game state, interpolated by alpha (0 to 1) between the previous and current tick'''
+    def render_frame(self, alpha=1):
+
+        if not self.profiler.enabled:
+            self.draw_frame(alpha)
             self.interface.update()
+            return
+
+        self.profiler.timed('redraw', self.draw_frame, alpha)
+        self.profiler.draw_overlay(self.interface)
+        self.profiler.timed('display_update', self.interface.update)
+        self.profiler.end_frame({'enemies': len(self.enemy_list), 'lasers': len(self.laser_list),
+                                 'explosions': len(self.explosion_list), 'powerups': len(self.powerup_list)})
 
-        return
 
+    '''Method to draw the current game state onto the display without refreshing the screen'''
+    def draw_frame(self, alpha=1):
+
+        player_ship = self.player_ship
+
+        #----------FRAME UPDATING----------
+
+        #update the frame with all modified object attributes - last objects are drawn on top
+        self.interface.clear_frame()
+
+        #queue every visible sprite by layer, then draw each layer with a single blits call
+        interface = self.interface
+
+        #if the final explosion was triggered, the explosion animation completes and rest of screen freezes
+        if self.game.final_explosion:
+
+            #a stunned ship blinks
+            if not player_ship.stunned or player_ship.stun_frame_count % STUN_BLIT_RATE in (0, 1, 2, 3):
+                interface.queue_many(LAYER_PLAYER, [player_ship.get_blit(alpha)])
+
+            interface.queue_many(LAYER_LASERS, [laser.get_blit(alpha) for laser in self.laser_list])
+
+            #flashing powerups are hidden for half of every flash period
+            interface.queue_many(LAYER_POWERUPS, [powerup.get_blit() for powerup in self.powerup_list
+                if not powerup.flashing or powerup.frame_count % POWERUP_FLASH_RATE <= (POWERUP_FLASH_RATE/2)])
+
+            interface.queue_many(LAYER_ENEMIES, [enemy.get_blit(alpha) for enemy in self.enemy_list])
+
+        #explosion frames follow the interpolated game time
+        ticks = self.game.ticks + alpha
+        interface.queue_many(LAYER_EXPLOSIONS, [explosion.get_blit(ticks - explosion.start_tick) for explosion in self.explosion_list])
+
+        interface.flush()
+
+        #update Earth healthbar
+        self.interface.update_healthbar(player_ship.health, player_ship.max_health)
 
 
     '''Method to handle game exiting.'''
@@ -663,37 +947,26 @@ class Main(object):
 
 
 
-    '''Method to check if a collision between 2 game objects has occurred. Returns true on collision. Hitboxes determine the object type.'''
-    def is_collision(self, object1, object2):
-
-        #PROJECTILE -> OBJECT
-        if hasattr(object1, 'hitbox') == False and hasattr(object2, 'hitbox') == True:
-        
-            #y-values check
-            if object1.y < object2.hitbox[1] + object2.hitbox[3] and object1.y + object1.height > object2.hitbox[1]:
-
-                #x-values check
-                if object1.x > object2.hitbox[0] and object1.x + object1.width < object2.hitbox[0] + object2.hitbox[2]:
-                    return True
-
-            return False
+    '''Method to find the enemy each laser reaches first over its move this tick, so fast lasers can't pass through enemies. Returns a dictionary of laser -> enemy, resolved in group order.'''
+    def find_laser_hits(self, laser_list, enemy_list):
 
+        #vectorized hit matrix over every laser/enemy pair
+        if self.collision_mode == 'batch':
+            return find_first_hits(laser_list, enemy_list)
 
-        #OBJECT -> OBJECT
-        else:
-            #y-values check
-            #object 1 collision from positive y
-            if object1.hitbox[1] < object2.hitbox[1] + object2.hitbox[3] and object1.hitbox[1] > object2.hitbox[1]:
+        #bucket enemies by grid cell so each laser is only tested against the enemies along its path
+        self.enemy_grid.build(enemy_list)
+        laser_hits = {}
+        for laser in laser_list:
+            enemy = self.enemy_grid.first_swept_collision(laser)
+            if enemy is not None:
+                laser_hits[laser] = enemy
+                self.enemy_grid.remove(enemy)
 
-                #x-values check
-                if object1.hitbox[0] < object2.hitbox[0] + object2.hitbox[2] and object1.hitbox[0] + object1.hitbox[2] > object2.hitbox[0]:
-                    return True
+        return laser_hits
 
-            #object 1 collision from negative y
-            elif object1.hitbox[1] + object1.hitbox[3] > object2.hitbox[1] and object1.hitbox[1] < object2.hitbox[1]:
 
-                #x-values check
-                if object1.hitbox[0] < object2.hitbox[0] + object2.hitbox[2] and object1.hitbox[0] + object1.hitbox[2] > object2.hitbox[0]:
-                    return True
 
-            return False
\ No newline at end of file
+    '''Method to check if a collision between 2 game objects has occurred. Returns true on collision. Hitboxes determine the object type.'''
+    def is_collision(self, object1, object2):
+        return is_collision(object1, object2)
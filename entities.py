@@ -0,0 +1,162 @@
+from array import array
+
+#NumPy is optional - the batch updates fall back to plain loops without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+#----------ENTITY TYPES----------
+TYPE_NONE = 0
+TYPE_PLAYER = 1
+TYPE_ENEMY = 2
+TYPE_LASER = 3
+TYPE_EXPLOSION = 4
+TYPE_POWERUP = 5
+
+
+class EntityStore(object):
+    '''
+    CLASS DESCRIPTION:
+        A struct-of-arrays store holding the position, size, velocity, timer and type of every game entity in
+        contiguous typed arrays, one slot per entity. Game objects are thin views over their slot, and per-tick
+        movement and timer updates run over whole arrays at once.
+
+    ----------
+    ATTRIBUTES:
+        x, y - the coordinates of every slot
+        prev_x, prev_y - the coordinates of every slot at the start of the current tick
+        width, height - the size of every slot
+        vel_x, vel_y - the distance every slot moves per tick when its type is integrated
+        timer - a per-slot tick counter (powerup lifetime, explosion frame count)
+        type_id - the TYPE_* of every slot, TYPE_NONE for free slots
+        owners - the game object viewing every slot, None for free slots
+        groups - the EntityGroup holding every slot, None for free slots
+
+        capacity - the number of slots currently allocated in the arrays
+        size - the high-water mark of used slots, batch updates only cover slots below it
+        live - the number of slots currently in use
+        free_slots - stack of free slot indices, the lowest index is reused first
+
+    ----------
+    METHODS:
+        __init__(self, capacity):
+            Creates a store with room for capacity entities, grown by doubling when full.
+
+        allocate(self, type_id, owner, group):
+            Gets a zeroed slot for a new entity of the passed type, viewed by the owner object and held by the group.
+
+        release(self, slot):
+            Frees a slot so it can be reused.
+
+        save_positions(self):
+            Copies the coordinates of every slot to prev_x and prev_y.
+
+        integrate(self, type_id):
+            Moves every entity of the passed type by its velocity.
+
+        tick_timers(self, type_id, delta):
+            Adds delta to the timer of every entity of the passed type.
+
+        get_stats(self):
+            Gets a dictionary of the store's capacity, live entity count and memory use.
+    '''
+    FIELDS = ('x', 'y', 'prev_x', 'prev_y', 'width', 'height', 'vel_x', 'vel_y', 'timer')
+
+    def __init__(self, capacity=256):
+        for field in self.FIELDS:
+            setattr(self, field, array('d', bytes(8 * capacity)))
+        self.type_id = array('B', bytes(capacity))
+        self.owners = [None] * capacity
+        self.groups = [None] * capacity
+
+        self.capacity = capacity
+        self.size = 0
+        self.live = 0
+        self.free_slots = list(range(capacity - 1, -1, -1))
+
+    def grow(self):
+        new_capacity = self.capacity * 2
+        for field in self.FIELDS:
+            getattr(self, field).extend(array('d', bytes(8 * self.capacity)))
+        self.type_id.extend(array('B', bytes(self.capacity)))
+        self.owners.extend([None] * self.capacity)
+        self.groups.extend([None] * self.capacity)
+
+        self.free_slots = list(range(new_capacity - 1, self.capacity - 1, -1)) + self.free_slots
+        self.capacity = new_capacity
+
+    def allocate(self, type_id, owner=None, group=None):
+        if not self.free_slots:
+            self.grow()
+
+        slot = self.free_slots.pop()
+        for field in self.FIELDS:
+            getattr(self, field)[slot] = 0.0
+        self.type_id[slot] = type_id
+        self.owners[slot] = owner
+        self.groups[slot] = group
+
+        if slot >= self.size:
+            self.size = slot + 1
+        self.live += 1
+        return slot
+
+    def release(self, slot):
+        self.type_id[slot] = TYPE_NONE
+        self.owners[slot] = None
+        self.groups[slot] = None
+        self.free_slots.append(slot)
+        self.live -= 1
+
+    def save_positions(self):
+        size = self.size
+        self.prev_x[:size] = self.x[:size]
+        self.prev_y[:size] = self.y[:size]
+
+    def view(self, field):
+        #zero-copy NumPy view over the used part of a field - never kept, so the arrays stay resizable
+        values = getattr(self, field)
+        return numpy.frombuffer(values, dtype=numpy.uint8 if values.typecode == 'B' else numpy.float64, count=self.size)
+
+    def integrate(self, type_id):
+        if numpy is not None:
+            selected = self.view('type_id') == type_id
+            x = self.view('x')
+            y = self.view('y')
+            x[selected] += self.view('vel_x')[selected]
+            y[selected] += self.view('vel_y')[selected]
+            return
+
+        x, y, vel_x, vel_y, types = self.x, self.y, self.vel_x, self.vel_y, self.type_id
+        for slot in range(self.size):
+            if types[slot] == type_id:
+                x[slot] += vel_x[slot]
+                y[slot] += vel_y[slot]
+
+    def tick_timers(self, type_id, delta):
+        if numpy is not None:
+            timer = self.view('timer')
+            timer[self.view('type_id') == type_id] += delta
+            return
+
+        timer, types = self.timer, self.type_id
+        for slot in range(self.size):
+            if types[slot] == type_id:
+                timer[slot] += delta
+
+    def get_stats(self):
+        return {'capacity': self.capacity, 'live': self.live, 'size': self.size,
+                'bytes': self.capacity * (8 * len(self.FIELDS) + 1)}
+
+
+def store_field(name):
+    '''Gets a property reading and writing the named EntityStore field at the entity's slot.'''
+    def get_field(self):
+        return getattr(self.store, name)[self.slot]
+
+    def set_field(self, value):
+        getattr(self.store, name)[self.slot] = value
+
+    return property(get_field, set_field)
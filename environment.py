@@ -0,0 +1,218 @@
+import sys
+import time
+import random
+import argparse
+
+#NumPy is needed for the observation arrays
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#importing headless selects the SDL dummy drivers before pygame initializes
+from headless import create_headless_game
+import pygame
+
+from earth_defense import *
+from classes import *
+
+#every combination of the INPUT_* bits is an action
+ACTION_COUNT = (INPUT_LEFT | INPUT_RIGHT | INPUT_UP | INPUT_DOWN | INPUT_FIRE) + 1
+POWERUP_MODIFIERS = list(powerup_imgs)
+
+#length of the state vector - player (x, y, health, stunned, shield), then (x, y, present) per enemy and
+#(x, y, present, one-hot modifier) per powerup
+PLAYER_FEATURES = 5
+ENEMY_FEATURES = 3
+POWERUP_FEATURES = 3 + len(POWERUP_MODIFIERS)
+
+
+#----------RL ENVIRONMENT----------
+class EarthDefenseEnv(object):
+    '''
+    CLASS DESCRIPTION:
+        A Gym-style reinforcement-learning environment over the Earth Defense rules. Every step holds one INPUT_*
+        bitmask for frame_skip simulation ticks on a headless Main, with no rendering (unless frames are observed)
+        and no frame delay. Rewards come from kills, minus a penalty for every enemy reaching Earth and for losing.
+
+    ----------
+    ATTRIBUTES:
+        main - the headless Main object running the game
+        observation - 'state' for the entity state vector, 'frame' for a downscaled RGB frame, 'gray' for a grayscale one
+        frame_skip - the number of ticks simulated per step
+        max_steps - the number of steps after which an episode is truncated, None for no limit
+        observed_enemies - the number of enemies (closest to Earth first) in the state vector
+        observed_powerups - the number of powerups in the state vector
+        frame_size - the (width, height) of frame observations
+
+        kill_reward - the reward for every enemy destroyed
+        earth_penalty - the penalty for every enemy reaching Earth
+        loss_penalty - the penalty for losing the game
+
+        action - the INPUT_* bitmask held during the current step
+        steps - the number of steps taken in the current episode
+        kills, earth_damage - the game counters at the end of the previous step
+
+    ----------
+    METHODS:
+        __init__(self, observation, frame_skip, max_steps, observed_enemies, observed_powerups, frame_size,
+                 kill_reward, earth_penalty, loss_penalty, main):
+            Creates the environment, with a new headless Main unless one is passed.
+
+        reset(self, seed):
+            Starts a new game. Returns the first observation and an info dictionary.
+
+        step(self, action):
+            Runs frame_skip ticks holding the passed action. Returns the observation, reward, terminated and
+            truncated flags, and an info dictionary.
+
+        get_observation(self):
+            Gets the observation of the current game state.
+
+        get_state(self):
+            Gets the entity state vector, with coordinates scaled to [0, 1] of the display.
+
+        get_frame(self):
+            Draws the current game state and gets it downscaled to frame_size, as a (height, width, channels) array.
+
+        get_info(self):
+            Gets the statistics of the current game.
+    '''
+    def __init__(self, observation='state', frame_skip=ENV_FRAME_SKIP, max_steps=None, observed_enemies=ENV_OBSERVED_ENEMIES,
+                 observed_powerups=ENV_OBSERVED_POWERUPS, frame_size=ENV_FRAME_SIZE, kill_reward=ENV_KILL_REWARD,
+                 earth_penalty=ENV_EARTH_PENALTY, loss_penalty=ENV_LOSS_PENALTY, main=None):
+        if numpy is None:
+            raise ImportError('EarthDefenseEnv needs NumPy for its observations')
+        if observation not in ('state', 'frame', 'gray'):
+            raise ValueError('unknown observation type: %s' % observation)
+
+        self.main = main if main is not None else create_headless_game()
+        self.observation = observation
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.observed_enemies = observed_enemies
+        self.observed_powerups = observed_powerups
+        self.frame_size = frame_size
+
+        self.kill_reward = kill_reward
+        self.earth_penalty = earth_penalty
+        self.loss_penalty = loss_penalty
+
+        self.action = 0
+        self.steps = 0
+        self.kills = 0
+        self.earth_damage = 0
+
+        #the game reads its inputs from the action of the current step
+        self.main.controller = lambda main: self.action
+
+    def reset(self, seed=None):
+        main = self.main
+        main.new_game(seed)
+        if self.observation != 'state':
+            main.interface.set_background(space_background)
+
+        self.action = 0
+        self.steps = 0
+        self.kills = 0
+        self.earth_damage = 0
+        return self.get_observation(), self.get_info()
+
+    def step(self, action):
+        if not 0 <= action < ACTION_COUNT:
+            raise ValueError('action must be an INPUT_* bitmask, got %r' % action)
+
+        game = self.main.game
+        self.action = action
+        self.main.run_ticks(self.frame_skip)
+        self.steps += 1
+
+        reward = (game.kills - self.kills) * self.kill_reward - (game.earth_damage - self.earth_damage) * self.earth_penalty
+        self.kills = game.kills
+        self.earth_damage = game.earth_damage
+
+        terminated = game.game_over
+        if terminated:
+            reward -= self.loss_penalty
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+
+        return self.get_observation(), reward, terminated, truncated, self.get_info()
+
+    def get_observation(self):
+        if self.observation == 'state':
+            return self.get_state()
+        return self.get_frame()
+
+    def get_state(self):
+        main = self.main
+        player_ship = main.player_ship
+        store = main.game.entities
+        state = numpy.zeros(PLAYER_FEATURES + ENEMY_FEATURES * self.observed_enemies + POWERUP_FEATURES * self.observed_powerups,
+                            dtype=numpy.float32)
+
+        state[:PLAYER_FEATURES] = (player_ship.x / DISPLAY_WIDTH, player_ship.y / DISPLAY_HEIGHT, player_ship.health / main.game.player_health,
+                                   player_ship.stunned, player_ship.shield)
+
+        #enemies straight from the entity store, closest to Earth first
+        slots = numpy.flatnonzero(store.view('type_id') == TYPE_ENEMY)
+        slots = slots[numpy.argsort(-store.view('y')[slots], kind='stable')][:self.observed_enemies]
+        enemies = state[PLAYER_FEATURES:PLAYER_FEATURES + ENEMY_FEATURES * len(slots)].reshape(-1, ENEMY_FEATURES)
+        enemies[:, 0] = store.view('x')[slots] / DISPLAY_WIDTH
+        enemies[:, 1] = store.view('y')[slots] / DISPLAY_HEIGHT
+        enemies[:, 2] = 1
+
+        offset = PLAYER_FEATURES + ENEMY_FEATURES * self.observed_enemies
+        for powerup in list(main.powerup_list)[:self.observed_powerups]:
+            state[offset:offset + 3] = (powerup.x / DISPLAY_WIDTH, powerup.y / DISPLAY_HEIGHT, 1)
+            state[offset + 3 + POWERUP_MODIFIERS.index(powerup.modifier)] = 1
+            offset += POWERUP_FEATURES
+
+        return state
+
+    def get_frame(self):
+        self.main.draw_frame()
+        pixels = self.main.interface.get_scaled_frame(self.frame_size, self.observation == 'gray')
+
+        #frame captures index pixels as (x, y), observations are (height, width, channels) and must outlive the next step
+        if self.observation == 'gray':
+            pixels = pixels[:, :, None]
+        return pixels.transpose(1, 0, 2).copy()
+
+    def get_info(self):
+        info = self.main.game.get_stats()
+        info['health'] = self.main.player_ship.health
+        info['steps'] = self.steps
+        return info
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Step the Earth Defense environment with random actions and print the step rate.')
+    parser.add_argument('--steps', type=int, default=10000, help='number of steps to take')
+    parser.add_argument('--observation', choices=('state', 'frame', 'gray'), default='state', help='observation type')
+    parser.add_argument('--frame-skip', type=int, default=ENV_FRAME_SKIP, help='ticks simulated per step')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for the games and the actions')
+    args = parser.parse_args()
+
+    env = EarthDefenseEnv(args.observation, args.frame_skip)
+    rng = random.Random(args.seed)
+    observation, info = env.reset(args.seed)
+
+    episodes = 0
+    total_reward = 0.0
+    start = time.perf_counter()
+    for i in range(args.steps):
+        observation, reward, terminated, truncated, info = env.step(rng.randrange(ACTION_COUNT))
+        total_reward += reward
+        if terminated or truncated:
+            episodes += 1
+            observation, info = env.reset(args.seed + episodes)
+    wall_seconds = time.perf_counter() - start
+
+    print('%-20s %s' % ('observation', '%s %s' % (args.observation, observation.shape)))
+    print('%-20s %d' % ('steps', args.steps))
+    print('%-20s %d' % ('episodes finished', episodes))
+    print('%-20s %.1f' % ('total reward', total_reward))
+    print('%-20s %.1f' % ('steps_per_second', args.steps / wall_seconds))
+
+    pygame.quit()
+    sys.exit(0)
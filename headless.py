@@ -0,0 +1,133 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+#SDL dummy drivers - no window and no audio device, must be set before pygame initializes
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from pygame.locals import *
+
+from earth_defense import *
+from classes import *
+
+
+#----------SCRIPTED PLAYERS----------
+class RandomBot(object):
+    '''
+    CLASS DESCRIPTION:
+        A scripted player that holds a random INPUT_* bitmask for a random number of ticks.
+
+    ----------
+    ATTRIBUTES:
+        rng - the random generator choosing the inputs
+        controls - the bitmask currently held
+        hold_ticks - the number of ticks left before a new bitmask is chosen
+
+    ----------
+    METHODS:
+        __init__(self, seed):
+            Creates the bot with its own seeded random generator.
+
+        __call__(self, main):
+            Gets the bitmask to hold during the next tick.
+    '''
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.controls = 0
+        self.hold_ticks = 0
+
+    def __call__(self, main):
+        if self.hold_ticks <= 0:
+            self.controls = self.rng.randint(0, INPUT_LEFT | INPUT_RIGHT | INPUT_UP | INPUT_DOWN | INPUT_FIRE)
+            self.hold_ticks = self.rng.randint(5, 60)
+        self.hold_ticks -= 1
+        return self.controls
+
+
+class TrackingBot(object):
+    '''
+    CLASS DESCRIPTION:
+        A scripted player that stays near the bottom of the field, moves under the lowest enemy and keeps firing.
+
+    ----------
+    METHODS:
+        __call__(self, main):
+            Gets the bitmask to hold during the next tick.
+    '''
+    def __call__(self, main):
+        player_ship = main.player_ship
+        controls = INPUT_FIRE
+
+        #keep away from the top of the field so lasers reach enemies before they get close
+        if player_ship.y < DISPLAY_HEIGHT - 3 * player_ship.height:
+            controls |= INPUT_DOWN
+
+        #target the enemy closest to Earth
+        if len(main.enemy_list):
+            target = max(main.enemy_list, key=lambda enemy: enemy.y)
+            offset = (target.x + target.width / 2) - (player_ship.x + player_ship.width / 2)
+            if offset < -player_ship.vel:
+                controls |= INPUT_LEFT
+            elif offset > player_ship.vel:
+                controls |= INPUT_RIGHT
+
+        return controls
+
+
+BOTS = {'random': RandomBot, 'tracking': TrackingBot}
+
+
+#----------HEADLESS SIMULATION----------
+def create_headless_game():
+    '''Initializes pygame on the dummy drivers and creates a headless Main, ready for new_game().'''
+    pygame.init()
+    interface = Interface(DISPLAY_WIDTH, DISPLAY_HEIGHT)
+    return Main(interface, headless=True)
+
+
+def run_headless(main=None, bot=None, max_ticks=None, seed=None):
+    '''
+    Runs a full game as fast as the CPU allows - no rendering, no audio and no frame delay - until it is over
+    or max_ticks is reached. Inputs come from bot, a callable taking the Main object and returning an INPUT_* bitmask.
+    Returns the end-of-game statistics.
+    '''
+    if main is None:
+        main = create_headless_game()
+    if bot is None:
+        bot = TrackingBot()
+
+    main.new_game(seed)
+    game = main.game
+
+    start = time.perf_counter()
+    while not (game.game_over and game.final_explosion):
+        if max_ticks is not None and game.ticks >= max_ticks:
+            break
+        main.update_tick(bot(main))
+    wall_seconds = time.perf_counter() - start
+
+    stats = game.get_stats()
+    stats['health'] = main.player_ship.health
+    stats['wall_seconds'] = wall_seconds
+    stats['ticks_per_second'] = game.ticks / wall_seconds if wall_seconds else 0.0
+    return stats
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run Earth Defense headless at full speed and print end-of-game statistics.')
+    parser.add_argument('--bot', choices=sorted(BOTS), default='tracking', help='scripted player providing the inputs')
+    parser.add_argument('--ticks', type=int, default=None, help='stop after this many ticks if the game is not over')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for the game and the bot')
+    args = parser.parse_args()
+
+    bot = RandomBot(args.seed) if args.bot == 'random' else BOTS[args.bot]()
+    stats = run_headless(bot=bot, max_ticks=args.ticks, seed=args.seed)
+    for name, value in stats.items():
+        print('%-20s %s' % (name, value))
+
+    pygame.quit()
+    sys.exit(0)
@@ -0,0 +1,169 @@
+import json
+import time
+from collections import OrderedDict, deque
+
+import pygame
+from pygame.locals import *
+
+
+class FrameProfiler(object):
+    '''
+    CLASS DESCRIPTION:
+        An instrumentation layer for the game loop. Times each maintenance phase and the redraw/display update of every
+        frame, keeps rolling windows of the timings, draws them as an on-screen overlay and records a trace that
+        chrome://tracing or Perfetto can open. While disabled the game loop skips it entirely.
+
+    ----------
+    ATTRIBUTES:
+        enabled - becomes True while the profiler is recording
+
+        window - the number of recent samples kept for every phase and for the frame time
+        samples - ordered mapping of phase names to their most recent timings in milliseconds
+        frame_times - the most recent frame times in milliseconds
+        frame_start - the perf_counter time at which the current frame started
+        counts - the live entity counts passed with the last frame
+
+        trace_events - the recorded trace events, capped at max_trace_events
+        max_trace_events - the maximum number of trace events kept, older events are dropped first
+        origin - the perf_counter time that trace timestamps are measured from
+
+        font - the font used to draw the overlay
+        overlay - the cached overlay surface, only re-rendered every overlay_interval frames
+        overlay_interval - the number of frames between overlay re-renders
+        frames - the number of frames recorded since the profiler was enabled
+
+    ----------
+    METHODS:
+        __init__(self, window, max_trace_events, overlay_interval):
+            Creates a disabled profiler.
+
+        toggle(self):
+            Enables or disables the profiler, starting from empty windows when enabled.
+
+        timed(self, name, function, *args):
+            Calls the function with the passed arguments and records its duration under the phase name.
+
+        end_frame(self, counts):
+            Records the frame time and the passed entity counts, and starts timing the next frame.
+
+        get_stats(self, name):
+            Gets the last, average and maximum timing of a phase in milliseconds.
+
+        get_histogram(self, bin_ms, bins):
+            Gets the number of recent frames falling in each bin_ms wide frame-time bin.
+
+        draw_overlay(self, interface):
+            Draws the FPS, frame time, per-phase timings, entity counts and frame-time histogram onto the display.
+
+        dump_trace(self, path):
+            Writes the recorded trace as Chrome trace event JSON.
+    '''
+    def __init__(self, window=180, max_trace_events=200000, overlay_interval=15):
+        self.enabled = False
+
+        self.window = window
+        self.samples = OrderedDict()
+        self.frame_times = deque(maxlen=window)
+        self.frame_start = None
+        self.counts = {}
+
+        self.trace_events = deque(maxlen=max_trace_events)
+        self.max_trace_events = max_trace_events
+        self.origin = time.perf_counter()
+
+        self.font = None
+        self.overlay = None
+        self.overlay_interval = overlay_interval
+        self.frames = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.samples.clear()
+            self.frame_times.clear()
+            self.frame_start = time.perf_counter()
+            self.overlay = None
+            self.frames = 0
+
+    def timed(self, name, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        end = time.perf_counter()
+
+        duration = (end - start) * 1000
+        if name not in self.samples:
+            self.samples[name] = deque(maxlen=self.window)
+        self.samples[name].append(duration)
+
+        #complete event - timestamps and durations in microseconds
+        self.trace_events.append({'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+                                  'ts': (start - self.origin) * 1000000, 'dur': duration * 1000})
+        return result
+
+    def end_frame(self, counts=None):
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            duration = (now - self.frame_start) * 1000
+            self.frame_times.append(duration)
+            self.trace_events.append({'name': 'frame', 'ph': 'X', 'pid': 1, 'tid': 0,
+                                      'ts': (self.frame_start - self.origin) * 1000000, 'dur': duration * 1000})
+
+        if counts:
+            self.counts = counts
+            self.trace_events.append({'name': 'entities', 'ph': 'C', 'pid': 1, 'ts': (now - self.origin) * 1000000, 'args': counts})
+
+        self.frame_start = now
+        self.frames += 1
+
+    def get_stats(self, name):
+        samples = self.frame_times if name == 'frame' else self.samples.get(name)
+        if not samples:
+            return (0.0, 0.0, 0.0)
+        return (samples[-1], sum(samples) / len(samples), max(samples))
+
+    def get_histogram(self, bin_ms=2, bins=16):
+        histogram = [0] * bins
+        for frame_time in self.frame_times:
+            histogram[min(int(frame_time // bin_ms), bins - 1)] += 1
+        return histogram
+
+    def draw_overlay(self, interface):
+        if self.overlay is None or self.frames % self.overlay_interval == 0:
+            self.overlay = self.render_overlay()
+        interface.redraw(self.overlay, 5, 5)
+
+    def render_overlay(self):
+        if self.font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self.font = pygame.font.Font(None, 18)
+
+        last, average, peak = self.get_stats('frame')
+        lines = ['FPS %5.1f   frame %5.2f ms (avg %5.2f, max %5.2f)' % (1000 / average if average else 0, last, average, peak)]
+        for name in self.samples:
+            last, average, peak = self.get_stats(name)
+            lines.append('%-15s %6.3f ms (avg %6.3f, max %6.3f)' % (name, last, average, peak))
+        lines.append('  '.join('%s %d' % (name, count) for name, count in self.counts.items()))
+
+        line_height = self.font.get_linesize()
+        histogram = self.get_histogram()
+        width = 330
+        height = line_height * len(lines) + 40
+        overlay = pygame.Surface((width, height), SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+
+        for i, line in enumerate(lines):
+            overlay.blit(self.font.render(line, True, (255, 255, 255)), (5, 3 + i * line_height))
+
+        #frame-time histogram, one bar per 2 ms bin
+        peak_count = max(histogram) or 1
+        bar_width = (width - 10) // len(histogram)
+        for i, count in enumerate(histogram):
+            bar_height = int(30 * count / peak_count)
+            pygame.draw.rect(overlay, (120, 220, 120), (5 + i * bar_width, height - 5 - bar_height, bar_width - 1, bar_height))
+
+        return overlay
+
+    def dump_trace(self, path):
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': list(self.trace_events), 'displayTimeUnit': 'ms'}, trace_file)
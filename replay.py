@@ -0,0 +1,231 @@
+import os
+import sys
+import struct
+import zlib
+import argparse
+
+'''
+REPLAY FILE FORMAT (little-endian):
+    header - magic b'EDRP', format version (uint8), tick rate (uint16), game seed (uint64)
+    records - a tag byte followed by its fields:
+        RUN (0x01): input bitmask (uint8), number of consecutive ticks it was held for (uint16)
+        END (0x02): total number of ticks (uint32), CRC32 digest of the final game state (uint32)
+'''
+REPLAY_MAGIC = b'EDRP'
+REPLAY_VERSION = 5          #bumped whenever a rule change makes older recordings play out differently
+HEADER = struct.Struct('<4sBHQ')
+RUN = struct.Struct('<BBH')
+END = struct.Struct('<BII')
+RUN_TAG = 0x01
+END_TAG = 0x02
+MAX_RUN = 0xFFFF
+
+
+def state_digest(main):
+    '''Gets a CRC32 digest of the simulated game state, used to check that a replay reproduced the recorded game.'''
+    game = main.game
+    player_ship = main.player_ship
+    state = [game.ticks, game.rng.getstate(), sorted(game.get_stats().items()),
+             (player_ship.x, player_ship.y, player_ship.health, player_ship.stunned, player_ship.stun_frame_count, player_ship.shield),
+             [(enemy.x, enemy.y) for enemy in main.enemy_list],
+             [(laser.x, laser.y) for laser in main.laser_list],
+             [(powerup.x, powerup.y, powerup.modifier, powerup.frame_count) for powerup in main.powerup_list],
+             len(main.explosion_list)]
+    return zlib.crc32(repr(state).encode())
+
+
+class InputRecorder(object):
+    '''
+    CLASS DESCRIPTION:
+        Records a game as its seed plus the run-length encoded INPUT_* bitmask of every tick, and writes it as a replay file.
+
+    ----------
+    ATTRIBUTES:
+        path - the replay file written when the recording finishes
+        tick_rate - the simulation tick rate the game was recorded at
+
+        seed - the seed of the recorded game
+        runs - list of [bitmask, tick count] runs of identical inputs
+        ticks - the number of ticks recorded
+
+    ----------
+    METHODS:
+        __init__(self, path, tick_rate):
+            Creates a recorder writing to the passed path.
+
+        start(self, seed):
+            Starts a new recording for a game created with the passed seed.
+
+        record(self, controls):
+            Appends the bitmask held during one tick.
+
+        finish(self, main):
+            Writes the recording and the digest of the final game state to the replay file.
+    '''
+    def __init__(self, path, tick_rate):
+        self.path = path
+        self.tick_rate = tick_rate
+        self.seed = None
+        self.runs = []
+        self.ticks = 0
+
+    def start(self, seed):
+        self.seed = seed
+        self.runs = []
+        self.ticks = 0
+
+    def record(self, controls):
+        if self.runs and self.runs[-1][0] == controls and self.runs[-1][1] < MAX_RUN:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([controls, 1])
+        self.ticks += 1
+
+    def finish(self, main):
+        if self.seed is None:
+            return
+
+        with open(self.path, 'wb') as replay_file:
+            replay_file.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.tick_rate, self.seed))
+            for controls, count in self.runs:
+                replay_file.write(RUN.pack(RUN_TAG, controls, count))
+            replay_file.write(END.pack(END_TAG, self.ticks, state_digest(main)))
+
+
+class InputReplay(object):
+    '''
+    CLASS DESCRIPTION:
+        Plays back a replay file as a Main controller, handing out the recorded bitmask of each tick in order.
+
+    ----------
+    ATTRIBUTES:
+        tick_rate - the simulation tick rate the game was recorded at
+        seed - the seed of the recorded game
+        inputs - the bitmask of every recorded tick
+        digest - the digest of the recorded final game state
+
+        index - the index of the next tick to play back
+        finished - becomes True once every recorded tick has been played back
+
+    ----------
+    METHODS:
+        __init__(self, path):
+            Reads and validates the replay file at the passed path.
+
+        __call__(self, main):
+            Gets the bitmask of the next tick. Once the replay runs out, stops the game and returns 0.
+
+        verify(self, main):
+            Returns True if the current game state matches the recorded final state.
+    '''
+    def __init__(self, path):
+        with open(path, 'rb') as replay_file:
+            data = replay_file.read()
+
+        magic, version, self.tick_rate, self.seed = HEADER.unpack_from(data, 0)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError('%s is not a version %d Earth Defense replay' % (path, REPLAY_VERSION))
+
+        self.inputs = bytearray()
+        self.digest = None
+        offset = HEADER.size
+        while offset < len(data):
+            if data[offset] == RUN_TAG:
+                tag, controls, count = RUN.unpack_from(data, offset)
+                self.inputs.extend(bytes([controls]) * count)
+                offset += RUN.size
+
+            elif data[offset] == END_TAG:
+                tag, ticks, self.digest = END.unpack_from(data, offset)
+                if ticks != len(self.inputs):
+                    raise ValueError('%s is truncated: %d of %d ticks' % (path, len(self.inputs), ticks))
+                offset += END.size
+
+            else:
+                raise ValueError('%s has an unknown record tag %#x at byte %d' % (path, data[offset], offset))
+
+        self.index = 0
+        self.finished = False
+
+    def __call__(self, main):
+        if self.index >= len(self.inputs):
+            self.finished = True
+            main.game.running = False
+            return 0
+
+        controls = self.inputs[self.index]
+        self.index += 1
+        return controls
+
+    def verify(self, main):
+        return self.digest is not None and state_digest(main) == self.digest
+
+
+#----------ENTRY POINTS----------
+def record(path):
+    '''Plays the game normally in a window, recording the last game played to path.'''
+    import pygame
+    from earth_defense import Main, Interface, DISPLAY_WIDTH, DISPLAY_HEIGHT, DIRTY_RECT_RENDERING, RENDER_SCALE, DISPLAY_FULLSCREEN, TICK_RATE
+
+    pygame.init()
+    main = Main(Interface(DISPLAY_WIDTH, DISPLAY_HEIGHT, DIRTY_RECT_RENDERING, RENDER_SCALE, DISPLAY_FULLSCREEN))
+    main.recorder = InputRecorder(path, TICK_RATE)
+    main.main_menu_screen()
+    pygame.quit()
+
+
+def play(path, fast=False):
+    '''
+    Plays back a replay file. In fast mode the game runs headless with rendering off, as fast as the CPU allows,
+    otherwise it plays in a window at real speed. Returns True if the final game state matches the recording.
+    '''
+    if fast:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    import pygame
+    from earth_defense import Main, Interface, DISPLAY_WIDTH, DISPLAY_HEIGHT, DIRTY_RECT_RENDERING, RENDER_SCALE, DISPLAY_FULLSCREEN, TICK_RATE
+
+    replay = InputReplay(path)
+    if replay.tick_rate != TICK_RATE:
+        raise ValueError('%s was recorded at %d ticks per second, the game runs at %d' % (path, replay.tick_rate, TICK_RATE))
+
+    pygame.init()
+    if fast:
+        main = Main(Interface(DISPLAY_WIDTH, DISPLAY_HEIGHT), headless=True)
+        main.new_game(replay.seed)
+        while True:
+            controls = replay(main)
+            if replay.finished:
+                break
+            main.update_tick(controls)
+
+    else:
+        main = Main(Interface(DISPLAY_WIDTH, DISPLAY_HEIGHT, DIRTY_RECT_RENDERING, RENDER_SCALE, DISPLAY_FULLSCREEN))
+        main.controller = replay
+        main.main(replay.seed)
+
+    matched = replay.index == len(replay.inputs) and replay.verify(main)
+    pygame.quit()
+    return matched
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Record and replay Earth Defense sessions.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='play the game and record the last game played')
+    record_parser.add_argument('path', help='replay file to write')
+
+    play_parser = subparsers.add_parser('play', help='play back a replay file')
+    play_parser.add_argument('path', help='replay file to read')
+    play_parser.add_argument('--fast', action='store_true', help='fast-forward headless with rendering off')
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        record(args.path)
+
+    else:
+        matched = play(args.path, args.fast)
+        print('replay %s the recorded game state' % ('matches' if matched else 'DOES NOT match'))
+        sys.exit(0 if matched else 1)
@@ -1,3 +1,6 @@
+import logging
+import argparse
+
 import pygame
 from pygame.locals import *
 
@@ -5,12 +8,19 @@ from earth_defense import *
 from classes import *
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Play Earth Defense.')
+    parser.add_argument('--scale', type=float, default=RENDER_SCALE, help='internal resolution as a fraction of the game coordinates, lower it on slow machines')
+    parser.add_argument('--fullscreen', action='store_true', default=DISPLAY_FULLSCREEN, help='scale the game to the whole screen')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(levelname)s: %(message)s')
+
+    #mixer settings must be set before pygame.init() initializes the mixer
+    pygame.mixer.pre_init(SFX_FREQUENCY, -16, 2, SFX_BUFFER_SIZE)
     pygame.init()
 
-    #game interface initialization
-    DISPLAY_WIDTH = 900
-    DISPLAY_HEIGHT = 600
-    game_interface = Interface(DISPLAY_WIDTH, DISPLAY_HEIGHT)
+    #game interface initialization - the game renders at a fraction of its coordinates, scaled up to the window
+    game_interface = Interface(DISPLAY_WIDTH, DISPLAY_HEIGHT, DIRTY_RECT_RENDERING, args.scale, args.fullscreen)
     #game_interface.set_background(main_menu_background)
     #game_interface.set_caption("Earth Defense")
 
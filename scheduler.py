@@ -0,0 +1,127 @@
+import heapq
+import itertools
+
+
+class Timer(object):
+    '''
+    CLASS DESCRIPTION:
+        A handle to a callback scheduled on a Scheduler.
+
+    ----------
+    ATTRIBUTES:
+        due - the time the callback is due at
+        callback - the function called when the timer fires
+        args - the arguments passed to the callback
+        entry - the id of the timer's current heap entry, None once it has fired or been cancelled
+
+    ----------
+    METHODS:
+        __init__(self, due, callback, args):
+            Creates a timer firing callback(*args) at due.
+
+        is_pending(self):
+            Returns True if the timer has neither fired nor been cancelled.
+    '''
+    def __init__(self, due, callback, args):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.entry = None
+
+    def is_pending(self):
+        return self.entry is not None
+
+
+class Scheduler(object):
+    '''
+    CLASS DESCRIPTION:
+        A priority queue of timers ordered by due time. Every update pops only the timers that are due, so idle timers
+        cost nothing per tick. Cancelled and rescheduled timers leave their old heap entries behind, which are skipped
+        when they reach the top. Time is in whatever unit the owner advances it by (Main uses game ticks).
+
+    ----------
+    ATTRIBUTES:
+        heap - the (due, entry id, timer) heap entries, soonest first
+        entries - counter handing out heap entry ids, which break ties between timers due at the same time in
+            scheduling order
+        now - the time of the latest run_due call
+
+        fired - the number of callbacks run
+        cancelled - the number of timers cancelled before firing
+
+    ----------
+    METHODS:
+        __init__(self, now):
+            Creates an empty scheduler starting at the passed time.
+
+        schedule(self, delay, callback, *args):
+            Gets a new timer firing callback(*args) delay after the current time.
+
+        push(self, timer):
+            Adds a heap entry for the timer at its due time, superseding any older entry.
+
+        cancel(self, timer):
+            Stops a pending timer from firing. Returns True if it was pending.
+
+        reschedule(self, timer, delay):
+            Moves a timer, pending or not, to fire delay after the current time.
+
+        run_due(self, now):
+            Advances the current time and fires every timer due by then, in due order. Returns the number fired.
+
+        get_stats(self):
+            Gets a dictionary of the pending timer count and the fired and cancelled counters.
+    '''
+    def __init__(self, now=0):
+        self.heap = []
+        self.entries = itertools.count()
+        self.now = now
+
+        self.fired = 0
+        self.cancelled = 0
+
+    def schedule(self, delay, callback, *args):
+        timer = Timer(self.now + delay, callback, args)
+        self.push(timer)
+        return timer
+
+    def push(self, timer):
+        timer.entry = next(self.entries)
+        heapq.heappush(self.heap, (timer.due, timer.entry, timer))
+
+    def cancel(self, timer):
+        if timer.entry is None:
+            return False
+
+        #the heap entry stays behind and is dropped when it reaches the top
+        timer.entry = None
+        self.cancelled += 1
+        return True
+
+    def reschedule(self, timer, delay):
+        timer.due = self.now + delay
+        self.push(timer)
+        return timer
+
+    def run_due(self, now):
+        self.now = now
+        heap = self.heap
+        count = 0
+
+        while heap and heap[0][0] <= now:
+            due, entry, timer = heapq.heappop(heap)
+
+            #stale entry of a cancelled or rescheduled timer
+            if entry != timer.entry:
+                continue
+
+            timer.entry = None
+            timer.callback(*timer.args)
+            count += 1
+
+        self.fired += count
+        return count
+
+    def get_stats(self):
+        return {'pending': sum(1 for due, entry, timer in self.heap if entry == timer.entry),
+                'fired': self.fired, 'cancelled': self.cancelled}
@@ -0,0 +1,144 @@
+import os
+import logging
+import itertools
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+
+class SoundEngine(object):
+    '''
+    CLASS DESCRIPTION:
+        A sound effect player with a fixed pool of reserved mixer channels. Sounds are loaded once, every effect has a
+        limit on the number of voices it can play at once, and when an effect or the whole pool is saturated the new
+        sound is either dropped or steals the oldest voice. Playing a sound only starts it on a channel, so it never
+        blocks the game loop. If the mixer cannot be initialized the engine stays disabled and every call does nothing.
+
+    ----------
+    ATTRIBUTES:
+        enabled - becomes True when the mixer is available and sounds can be played
+        policy - 'steal' to cut off the oldest voice when saturated, 'drop' to skip the new sound instead
+
+        channels - the reserved pygame.mixer.Channel objects used for sound effects
+        sounds - mapping of effect names to their loaded pygame.mixer.Sound
+        voice_limits - mapping of effect names to the maximum number of voices they can play at once
+        voices - mapping of channels to the (effect name, start order) of the sound they were last given
+        order - counter handing out the start order of every played sound
+
+        played - the number of sounds started
+        dropped - the number of sounds skipped because their effect or the channel pool was saturated
+        stolen - the number of voices cut off to make room for a new sound
+
+    ----------
+    METHODS:
+        __init__(self, channels, policy, enabled):
+            Initializes the mixer if needed and reserves the channel pool, staying disabled if the mixer fails.
+
+        load(self, name, path, max_voices, volume):
+            Loads the sound file at path under the effect name. Returns True if the sound was loaded.
+
+        play(self, name):
+            Starts the named effect on a free or stolen channel. Returns the channel, or None if nothing was played.
+
+        find_free_channel(self):
+            Gets a reserved channel that is not playing, or None if every channel is busy.
+
+        stop(self):
+            Stops every sound effect.
+
+        get_stats(self):
+            Gets a dictionary of the played, dropped and stolen counters.
+    '''
+    def __init__(self, channels=8, policy='steal', enabled=True):
+        self.enabled = False
+        self.policy = policy
+        self.channels = []
+        self.sounds = {}
+        self.voice_limits = {}
+        self.voices = {}
+        self.order = itertools.count()
+
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+
+        if not enabled:
+            return
+
+        try:
+            if pygame.mixer.get_init() is None:
+                pygame.mixer.init()
+        except pygame.error as error:
+            logger.warning('sound effects disabled - mixer unavailable: %s', error)
+            return
+
+        #reserved channels are never handed out by Sound.play or find_channel, so music and other sounds cannot take them
+        if pygame.mixer.get_num_channels() < channels:
+            pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.enabled = True
+
+    def load(self, name, path, max_voices=2, volume=1.0):
+        if not self.enabled or path is None:
+            return False
+
+        if not os.path.exists(path):
+            logger.warning('sound effect %s not found: %s', name, path)
+            return False
+
+        try:
+            sound = pygame.mixer.Sound(path)
+        except pygame.error as error:
+            logger.warning('sound effect %s could not be loaded: %s', name, error)
+            return False
+
+        sound.set_volume(volume)
+        self.sounds[name] = sound
+        self.voice_limits[name] = max_voices
+        return True
+
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+
+        #voices of this effect still playing, oldest first
+        active = sorted((channel for channel, (voice, order) in self.voices.items() if voice == name and channel.get_busy()),
+                        key=lambda channel: self.voices[channel][1])
+
+        if len(active) >= self.voice_limits[name]:
+            if self.policy == 'drop':
+                self.dropped += 1
+                return None
+            channel = active[0]
+            self.stolen += 1
+
+        else:
+            channel = self.find_free_channel()
+            if channel is None:
+                if self.policy == 'drop':
+                    self.dropped += 1
+                    return None
+                channel = min(self.voices, key=lambda channel: self.voices[channel][1])
+                self.stolen += 1
+
+        channel.play(sound)
+        self.voices[channel] = (name, next(self.order))
+        self.played += 1
+        return channel
+
+    def find_free_channel(self):
+        for channel in self.channels:
+            if not channel.get_busy():
+                return channel
+        return None
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
+        self.voices.clear()
+
+    def get_stats(self):
+        return {'played': self.played, 'dropped': self.dropped, 'stolen': self.stolen}
@@ -0,0 +1,221 @@
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import statistics
+
+import pygame
+from pygame.locals import *
+
+from earth_defense import *
+from classes import *
+import collision
+
+#enemies spawned per second t seconds into a swarm game, given the start rate and the curve's growth
+SPAWN_CURVES = {'constant': lambda t, rate, growth: rate,
+                'linear': lambda t, rate, growth: rate + growth * t,
+                'exponential': lambda t, rate, growth: rate * math.exp(growth * t),
+                'waves': lambda t, rate, growth: rate + growth * (t // 10)}
+
+
+#----------SWARM MODE----------
+class SwarmMode(object):
+    '''
+    CLASS DESCRIPTION:
+        A stress game mode spawning hundreds to thousands of slow enemies along a spawn curve. Earth is invulnerable,
+        so the game only ends when the player stops it, and laser collisions use the vectorized batch engine.
+
+    ----------
+    ATTRIBUTES:
+        curve - the name of the SPAWN_CURVES entry giving the spawn rate over time
+        rate - the spawn rate (enemies per second) at the start of the game
+        growth - the growth parameter of the spawn curve
+        max_enemies - the maximum number of enemies on the field at once
+        enemy_vel - the travel speed of the swarm's enemies
+
+        budget - the fractional number of enemies owed by the spawn curve but not spawned yet
+        last_time - the simulated time of the previous spawn decision
+
+    ----------
+    METHODS:
+        __init__(self, curve, rate, growth, max_enemies, enemy_vel):
+            Creates the mode with the passed spawn curve.
+
+        setup(self, main):
+            Applies the mode to the new game of the passed Main object.
+
+        __call__(self, game, enemy_count):
+            Gets the number of enemies to spawn this tick.
+    '''
+    def __init__(self, curve=SWARM_CURVE, rate=SWARM_SPAWN_RATE, growth=SWARM_SPAWN_GROWTH, max_enemies=SWARM_MAX_ENEMIES,
+                 enemy_vel=SWARM_ENEMY_VEL):
+        self.curve = curve
+        self.rate = rate
+        self.growth = growth
+        self.max_enemies = max_enemies
+        self.enemy_vel = enemy_vel
+
+        self.budget = 0.0
+        self.last_time = 0
+
+    def setup(self, main):
+        game = main.game
+        game.spawner = self
+        game.invulnerable = True
+        game.max_enemies = self.max_enemies
+        game.enemy_vel = self.enemy_vel
+
+        #thousands of enemies need the vectorized laser collisions
+        if collision.numpy is not None:
+            main.collision_mode = 'batch'
+
+        self.budget = 0.0
+        self.last_time = game.sim_time
+
+    def __call__(self, game, enemy_count):
+        self.budget += SPAWN_CURVES[self.curve](game.sim_time / 1000, self.rate, self.growth) * (game.sim_time - self.last_time) / 1000
+        self.last_time = game.sim_time
+
+        count = int(self.budget)
+        self.budget -= count
+        return max(0, min(count, self.max_enemies - enemy_count))
+
+
+class SweepBot(object):
+    '''
+    CLASS DESCRIPTION:
+        A scripted player for swarm benchmarks that keeps firing while sweeping across the bottom of the field.
+
+    ----------
+    ATTRIBUTES:
+        direction - INPUT_LEFT or INPUT_RIGHT, the direction the ship is currently sweeping in
+
+    ----------
+    METHODS:
+        __call__(self, main):
+            Gets the bitmask to hold during the next tick.
+    '''
+    def __init__(self):
+        self.direction = INPUT_RIGHT
+
+    def __call__(self, main):
+        player_ship = main.player_ship
+        if player_ship.x <= player_ship.width:
+            self.direction = INPUT_RIGHT
+        elif player_ship.x >= DISPLAY_WIDTH - 2 * player_ship.width:
+            self.direction = INPUT_LEFT
+
+        controls = INPUT_FIRE | self.direction
+        if player_ship.y < DISPLAY_HEIGHT - 3 * player_ship.height:
+            controls |= INPUT_DOWN
+        return controls
+
+
+#----------SCALABILITY BENCHMARK----------
+def run_swarm(main, mode, seconds, target_fps=SWARM_TARGET_FPS, seed=0, bot=None):
+    '''
+    Plays a swarm game for seconds of real time through the fixed-timestep loop, rendering every frame at no more
+    than target_fps, and gets one sample per second of the enemy count, frame rate and simulation speed.
+    '''
+    if bot is None:
+        bot = SweepBot()
+
+    main.game_mode = mode
+    main.new_game(seed)
+    main.interface.set_background(space_background)
+
+    samples = []
+    frame_times = []
+    accumulator = 0
+    clock = pygame.time.Clock()
+    start = window_start = time.perf_counter()
+    window_ticks = main.game.ticks
+
+    while time.perf_counter() - start < seconds:
+        accumulator += min(clock.tick(target_fps), MAX_FRAME_TIME)
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                return samples
+
+        while accumulator >= TICK_TIME:
+            main.update_tick(bot(main))
+            accumulator -= TICK_TIME
+
+        frame_start = time.perf_counter()
+        main.render_frame(accumulator / TICK_TIME)
+        frame_times.append(time.perf_counter() - frame_start)
+
+        #one sample per second - the simulation speed falls below 1 once ticks cannot keep up with real time
+        now = time.perf_counter()
+        if now - window_start >= 1:
+            elapsed = now - window_start
+            samples.append({'second': len(samples) + 1, 'enemies': len(main.enemy_list), 'fps': len(frame_times) / elapsed,
+                            'render_ms': statistics.fmean(frame_times) * 1000,
+                            'sim_speed': (main.game.ticks - window_ticks) * TICK_TIME / 1000 / elapsed})
+            frame_times = []
+            window_start = now
+            window_ticks = main.game.ticks
+
+    return samples
+
+
+def print_report(samples, target_fps=SWARM_TARGET_FPS, bucket=250):
+    '''Prints every per-second sample, then the sustained (lowest) and mean FPS per bucket of enemy counts.'''
+    print('%6s %8s %8s %10s %9s' % ('second', 'enemies', 'fps', 'render ms', 'sim speed'))
+    for sample in samples:
+        print('%6d %8d %8.1f %10.2f %9.2f' % (sample['second'], sample['enemies'], sample['fps'], sample['render_ms'], sample['sim_speed']))
+
+    buckets = {}
+    for sample in samples:
+        buckets.setdefault(sample['enemies'] // bucket * bucket, []).append(sample)
+
+    print()
+    print('%13s %14s %9s %10s %8s' % ('enemies', 'sustained fps', 'mean fps', 'sim speed', 'target'))
+    for low in sorted(buckets):
+        fps = [sample['fps'] for sample in buckets[low]]
+        sim_speed = min(sample['sim_speed'] for sample in buckets[low])
+        held = min(fps) >= 0.95 * target_fps and sim_speed >= 0.95
+        print('%6d-%-6d %14.1f %9.1f %10.2f %8s' % (low, low + bucket - 1, min(fps), statistics.fmean(fps), sim_speed, 'held' if held else 'missed'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Earth Defense swarm mode - play it, or benchmark FPS against enemy count.')
+    parser.add_argument('--play', action='store_true', help='play swarm mode from the main menu instead of benchmarking')
+    parser.add_argument('--curve', choices=sorted(SPAWN_CURVES), default=SWARM_CURVE, help='spawn curve')
+    parser.add_argument('--rate', type=float, default=SWARM_SPAWN_RATE, help='enemies spawned per second at the start')
+    parser.add_argument('--growth', type=float, default=SWARM_SPAWN_GROWTH, help='growth parameter of the spawn curve')
+    parser.add_argument('--max-enemies', type=int, default=SWARM_MAX_ENEMIES, help='maximum number of enemies on the field')
+    parser.add_argument('--seconds', type=float, default=60, help='benchmark duration in real seconds')
+    parser.add_argument('--target-fps', type=int, default=SWARM_TARGET_FPS, help='frame rate the benchmark renders at and must hold')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for the game')
+    parser.add_argument('--headless', action='store_true', help='benchmark on the SDL dummy video and audio drivers')
+    parser.add_argument('--scale', type=float, default=RENDER_SCALE, help='internal resolution as a fraction of the game coordinates')
+    parser.add_argument('--output', help='JSON file to save the per-second samples to')
+    args = parser.parse_args()
+
+    if args.headless:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    pygame.init()
+    mode = SwarmMode(args.curve, args.rate, args.growth, args.max_enemies)
+
+    if args.play:
+        main = Main(Interface(DISPLAY_WIDTH, DISPLAY_HEIGHT, DIRTY_RECT_RENDERING, args.scale, DISPLAY_FULLSCREEN))
+        main.game_mode = mode
+        main.main_menu_screen()
+
+    else:
+        main = Main(Interface(DISPLAY_WIDTH, DISPLAY_HEIGHT, DIRTY_RECT_RENDERING, args.scale), headless=args.headless)
+        samples = run_swarm(main, mode, args.seconds, args.target_fps, args.seed)
+        print_report(samples, args.target_fps)
+
+        if args.output:
+            with open(args.output, 'w') as output_file:
+                json.dump({'curve': args.curve, 'rate': args.rate, 'growth': args.growth, 'target_fps': args.target_fps,
+                           'samples': samples}, output_file, indent=2)
+
+    pygame.quit()
+    sys.exit(0)